@@ -0,0 +1,77 @@
+""" Tests for the options only solution8_stream.py has """
+
+import os
+import platform
+import shutil
+import tempfile
+from subprocess import getstatusoutput
+
+PRG = './solution8_stream.py'
+RUN = f'python {PRG}' if platform.system() == 'Windows' else PRG
+INPUT1 = './tests/inputs/input1.txt'
+INPUT2 = './tests/inputs/input2.txt'
+
+
+# --------------------------------------------------
+def test_files() -> None:
+    """ Counts each file and the total """
+
+    rv, out = getstatusoutput(f'{RUN} {INPUT1} {INPUT2}')
+    assert rv == 0
+    assert out.splitlines() == [
+        f'{INPUT1} 1 2 3 4',
+        f'{INPUT2} 20 12 17 21',
+        'total 21 14 20 25',
+    ]
+
+
+# --------------------------------------------------
+def test_dir() -> None:
+    """ Reads the files in a directory """
+
+    rv, out = getstatusoutput(f'{RUN} ./tests/inputs')
+    assert rv == 0
+    assert out.splitlines() == [
+        './tests/inputs/input1.txt 1 2 3 4',
+        './tests/inputs/input2.txt 20 12 17 21',
+        './tests/inputs/input3.txt 196 231 237 246',
+        './tests/inputs/input4.txt 3 2 11 6',
+        'total 220 247 268 277',
+    ]
+
+
+# --------------------------------------------------
+def test_workers() -> None:
+    """ Worker processes give the same answer """
+
+    rv, out = getstatusoutput(f'{RUN} ./tests/inputs')
+    assert rv == 0
+    assert getstatusoutput(f'{RUN} -w 2 ./tests/inputs') == (0, out)
+
+
+# --------------------------------------------------
+def test_bad_workers() -> None:
+    """ Dies on bad --workers """
+
+    rv, out = getstatusoutput(f'{RUN} -w 0 {INPUT1}')
+    assert rv != 0
+    assert out.lower().startswith('usage:')
+    assert '--workers "0" must be greater than 0' in out
+
+
+# --------------------------------------------------
+def test_one_dir() -> None:
+    """ A directory prints a line per file even when it has one file """
+
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        shutil.copy(INPUT1, tmp_dir)
+        rv, out = getstatusoutput(f'{RUN} {tmp_dir}')
+        assert rv == 0
+        assert out.splitlines() == [
+            f'{os.path.join(tmp_dir, "input1.txt")} 1 2 3 4',
+            'total 1 2 3 4',
+        ]
+
+    finally:
+        shutil.rmtree(tmp_dir)
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+""" Tetranucleotide frequency profiles for each record in a FASTA file """
+
+import argparse
+import sys
+from itertools import product
+from typing import NamedTuple, TextIO
+from Bio import SeqIO
+import numpy as np
+
+K = 4
+KMERS = [''.join(kmer) for kmer in product('ACGT', repeat=K)]
+
+# Map ASCII bytes to 2-bit base codes, anything not ACGT/acgt becomes 4
+CODES = np.full(256, 4, dtype=np.uint8)
+for code, base in enumerate('ACGT'):
+    CODES[ord(base)] = CODES[ord(base.lower())] = code
+
+
+class Args(NamedTuple):
+    """ Command-line arguments """
+    file: TextIO
+    outfile: TextIO
+    counts: bool
+
+
+# --------------------------------------------------
+def get_args() -> Args:
+    """ Get command-line arguments """
+
+    parser = argparse.ArgumentParser(
+        description='Tetranucleotide frequency profiles',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+
+    parser.add_argument('file',
+                        metavar='FILE',
+                        type=argparse.FileType('rt'),
+                        nargs='?',
+                        default=sys.stdin,
+                        help='Input FASTA file')
+
+    parser.add_argument('-o',
+                        '--outfile',
+                        metavar='FILE',
+                        type=argparse.FileType('wt'),
+                        default=sys.stdout,
+                        help='Output file')
+
+    parser.add_argument('-c',
+                        '--counts',
+                        action='store_true',
+                        help='Print raw counts instead of frequencies')
+
+    args = parser.parse_args()
+
+    return Args(args.file, args.outfile, args.counts)
+
+
+# --------------------------------------------------
+def main() -> None:
+    """ Make a jazz noise here """
+
+    args = get_args()
+
+    row_fmt = '\t'.join(['%d' if args.counts else '%.6f'] * len(KMERS))
+
+    print('\t'.join(['id'] + KMERS), file=args.outfile)
+
+    # Write each row as soon as it is computed to keep memory bounded
+    for rec in SeqIO.parse(args.file, 'fasta'):
+        counts = tetra(bytes(rec.seq))
+        row = counts if args.counts else frequencies(counts)
+        print(rec.id, row_fmt % tuple(row), sep='\t', file=args.outfile)
+
+
+# --------------------------------------------------
+def kmer_codes(seq: bytes, k: int = K) -> np.ndarray:
+    """ Integer codes of the k-mers in a sequence, skipping non-ACGT """
+
+    codes = CODES[np.frombuffer(seq, dtype=np.uint8)]
+    n = len(codes) - k + 1
+    if n < 1:
+        return np.empty(0, dtype=np.int64)
+
+    # Roll each base into the code by shifting the previous bases left
+    kmers = np.zeros(n, dtype=np.int64)
+    invalid = np.zeros(n, dtype=bool)
+    for i in range(k):
+        window = codes[i:i + n]
+        kmers = (kmers << 2) | (window & 3)
+        invalid |= window > 3
+
+    return kmers[~invalid]
+
+
+# --------------------------------------------------
+def test_kmer_codes() -> None:
+    """ Test kmer_codes """
+
+    assert kmer_codes(b'').tolist() == []
+    assert kmer_codes(b'ACG').tolist() == []
+    assert kmer_codes(b'AAAA').tolist() == [0]
+    assert kmer_codes(b'TTTT').tolist() == [255]
+    assert kmer_codes(b'acgt').tolist() == [KMERS.index('ACGT')]
+    assert kmer_codes(b'AAAAC').tolist() == [0, 1]
+    assert kmer_codes(b'AANAAAA').tolist() == [0]
+    assert kmer_codes(b'ACGT', k=2).tolist() == [1, 6, 11]
+
+
+# --------------------------------------------------
+def tetra(seq: bytes) -> np.ndarray:
+    """ Count all 4-mers in a sequence """
+
+    return np.bincount(kmer_codes(seq), minlength=len(KMERS))
+
+
+# --------------------------------------------------
+def test_tetra() -> None:
+    """ Test tetra """
+
+    assert tetra(b'').sum() == 0
+    assert len(tetra(b'')) == 256
+
+    counts = tetra(b'ACGTACGT')
+    assert counts.sum() == 5
+    assert counts[KMERS.index('ACGT')] == 2
+    assert counts[KMERS.index('CGTA')] == 1
+
+
+# --------------------------------------------------
+def frequencies(counts: np.ndarray) -> np.ndarray:
+    """ Normalize counts to frequencies """
+
+    total = counts.sum()
+    return counts / total if total else np.zeros(len(counts))
+
+
+# --------------------------------------------------
+def test_frequencies() -> None:
+    """ Test frequencies """
+
+    assert frequencies(np.array([0, 0])).tolist() == [0., 0.]
+    assert frequencies(np.array([1, 3])).tolist() == [.25, .75]
+
+
+# --------------------------------------------------
+if __name__ == '__main__':
+    main()
@@ -2,15 +2,23 @@
 """ Generate long sequence """
 
 import argparse
-import random
-from typing import NamedTuple, TextIO
+import os
+import sys
+from typing import BinaryIO, NamedTuple, Optional
+
+# bin/ is not a package, so put it on the path to share seqgen.py
+sys.path.append(
+    os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', 'bin'))
+from seqgen import Spec, generate  # noqa: E402 pylint: disable=E0401,C0413
 
 
 class Args(NamedTuple):
     """ Command-line arguments """
     seq_len: int
     num_seqs: int
-    out_file: TextIO
+    out_file: BinaryIO
+    seed: Optional[int]
+    workers: int
 
 
 # --------------------------------------------------
@@ -39,12 +47,28 @@ def get_args() -> Args:
                         '--outfile',
                         help='Output file',
                         metavar='FILE',
-                        type=argparse.FileType('wt'),
+                        type=argparse.FileType('wb'),
                         default='seq.txt')
 
+    parser.add_argument('--seed',
+                        help='Random seed',
+                        metavar='int',
+                        type=int,
+                        default=None)
+
+    parser.add_argument('-w',
+                        '--workers',
+                        help='Number of worker processes',
+                        metavar='int',
+                        type=int,
+                        default=1)
+
     args = parser.parse_args()
 
-    return Args(args.len, args.num, args.outfile)
+    if args.workers < 1:
+        parser.error(f'--workers "{args.workers}" must be greater than 0')
+
+    return Args(args.len, args.num, args.outfile, args.seed, args.workers)
 
 
 # --------------------------------------------------
@@ -52,9 +76,11 @@ def main() -> None:
     """ Make a jazz noise here """
 
     args = get_args()
-    for _ in range(args.num_seqs):
-        print(''.join([random.choice('ACGT') for _ in range(args.seq_len)]),
-              file=args.out_file)
+    generate(args.out_file,
+             args.num_seqs,
+             Spec(args.seq_len),
+             seed=args.seed,
+             workers=args.workers)
     print(f'Done, see "{args.out_file.name}".')
 
 
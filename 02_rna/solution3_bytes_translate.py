@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+""" Transcribe DNA into RNA """
+
+import argparse
+import io
+import os
+from multiprocessing import Pool
+from typing import BinaryIO, Callable, Dict, NamedTuple, List
+
+# Read files in blocks of this many bytes
+BUFSIZE = 1024 * 1024
+
+# Translation table from DNA to RNA
+DNA_TO_RNA = bytes.maketrans(b'Tt', b'Uu')
+
+
+class Args(NamedTuple):
+    """ Command-line arguments """
+    files: List[str]
+    out_dir: str
+    workers: int
+    format: str
+
+
+# --------------------------------------------------
+def get_args() -> Args:
+    """ Get command-line arguments """
+
+    parser = argparse.ArgumentParser(
+        description='Transcribe DNA into RNA',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+
+    parser.add_argument('file',
+                        help='Input DNA file(s)',
+                        metavar='FILE',
+                        nargs='+')
+
+    parser.add_argument('-o',
+                        '--out_dir',
+                        help='Output directory',
+                        metavar='DIR',
+                        type=str,
+                        default='out')
+
+    parser.add_argument('-w',
+                        '--workers',
+                        help='Number of worker processes',
+                        metavar='int',
+                        type=int,
+                        default=1)
+
+    parser.add_argument('-f',
+                        '--format',
+                        help='Input format, FASTA/FASTQ headers and '
+                        'quality lines are not changed',
+                        metavar='format',
+                        choices=['txt', 'fasta', 'fastq'],
+                        default='txt')
+
+    args = parser.parse_args()
+
+    # Check the files but do not open them, the workers will do that
+    for file in args.file:
+        if not os.path.isfile(file):
+            parser.error(f"can't open '{file}': "
+                         f"No such file or directory: '{file}'")
+
+    if args.workers < 1:
+        parser.error(f'--workers "{args.workers}" must be greater than 0')
+
+    # Each input is written to a file of the same name in the output
+    # directory, and the workers must not write the same file at once
+    seen: Dict[str, str] = {}
+    for file in args.file:
+        if (name := os.path.basename(file)) in seen:
+            parser.error(f'"{seen[name]}" and "{file}" would both be '
+                         f'written to "{os.path.join(args.out_dir, name)}"')
+        seen[name] = file
+
+    return Args(args.file, args.out_dir, args.workers, args.format)
+
+
+# --------------------------------------------------
+def main() -> None:
+    """ Make a jazz noise here """
+
+    args = get_args()
+
+    if not os.path.isdir(args.out_dir):
+        os.makedirs(args.out_dir)
+
+    jobs = [(file, os.path.join(args.out_dir,
+                                os.path.basename(file)), args.format)
+            for file in args.files]
+
+    # Each worker has only one input and one output file open at a time
+    if args.workers > 1 and len(jobs) > 1:
+        with Pool(min(args.workers, len(jobs))) as pool:
+            counts = pool.starmap(transcribe_file, jobs, chunksize=1)
+    else:
+        counts = [transcribe_file(*job) for job in jobs]
+
+    num_files, num_seqs = len(jobs), sum(counts)
+
+    print(f'Done, wrote {num_seqs} sequence{"" if num_seqs == 1 else "s"} '
+          f'in {num_files} file{"" if num_files == 1 else "s"} '
+          f'to directory "{args.out_dir}".')
+
+
+# --------------------------------------------------
+def transcribe_file(in_file: str, out_file: str, fmt: str = 'txt') -> int:
+    """ Transcribe one file, return the number of sequences """
+
+    with open(in_file, 'rb') as in_fh, open(out_file, 'wb') as out_fh:
+        return TRANSCRIBERS[fmt](in_fh, out_fh, BUFSIZE)
+
+
+# --------------------------------------------------
+def transcribe(in_fh: BinaryIO, out_fh: BinaryIO, size: int = BUFSIZE) -> int:
+    """ Transcribe a file in blocks, return the number of lines """
+
+    num_lines, last = 0, b'\n'
+    while buf := in_fh.read(size):
+        out_fh.write(buf.translate(DNA_TO_RNA))
+        num_lines += buf.count(b'\n')
+        last = buf[-1:]
+
+    # Count a final line that has no newline
+    return num_lines + (last != b'\n')
+
+
+# --------------------------------------------------
+def test_transcribe() -> None:
+    """ Test transcribe """
+
+    for dna, rna, num in [(b'', b'', 0), (b'\n', b'\n', 1),
+                          (b'ACGT', b'ACGU', 1), (b'acgt\n', b'acgu\n', 1),
+                          (b'TTT\nGATTACA\n\nA', b'UUU\nGAUUACA\n\nA', 4)]:
+        for size in [1, 2, 5, BUFSIZE]:
+            out_fh = io.BytesIO()
+            assert transcribe(io.BytesIO(dna), out_fh, size) == num
+            assert out_fh.getvalue() == rna
+
+
+# --------------------------------------------------
+def transcribe_fasta(in_fh: BinaryIO,
+                     out_fh: BinaryIO,
+                     size: int = BUFSIZE) -> int:
+    """ Transcribe FASTA in blocks, return the number of records """
+
+    num_recs, in_header, line_start = 0, False, True
+    while buf := in_fh.read(size):
+        pos = 0
+        while pos < len(buf):
+            # Copy header lines, which may span blocks, unchanged
+            if in_header:
+                newline = buf.find(b'\n', pos)
+                end = len(buf) if newline < 0 else newline + 1
+                out_fh.write(buf[pos:end])
+                pos, in_header, line_start = end, newline < 0, True
+                continue
+
+            # Only a ">" at the start of a line begins a header
+            if line_start and buf[pos] == ord('>'):
+                num_recs += 1
+                in_header = True
+                continue
+
+            next_header = buf.find(b'\n>', pos)
+            end = len(buf) if next_header < 0 else next_header + 1
+            out_fh.write(buf[pos:end].translate(DNA_TO_RNA))
+            line_start = buf[end - 1] == ord('\n')
+            pos = end
+
+    return num_recs
+
+
+# --------------------------------------------------
+def test_transcribe_fasta() -> None:
+    """ Test transcribe_fasta """
+
+    for dna, rna, num in [
+        (b'', b'', 0),
+        (b'>T1 TTT\nTTTT\nAC\n', b'>T1 TTT\nUUUU\nAC\n', 1),
+        (b'>a\nAT\n>b T\nGT\n>c\n', b'>a\nAU\n>b T\nGU\n>c\n', 3),
+        (b'>a\nAT>T\nT\n', b'>a\nAU>U\nU\n', 1),
+    ]:
+        for size in [1, 2, 5, BUFSIZE]:
+            out_fh = io.BytesIO()
+            assert transcribe_fasta(io.BytesIO(dna), out_fh, size) == num
+            assert out_fh.getvalue() == rna
+
+
+# --------------------------------------------------
+def transcribe_fastq(in_fh: BinaryIO,
+                     out_fh: BinaryIO,
+                     size: int = BUFSIZE) -> int:
+    """ Transcribe FASTQ in blocks, return the number of records """
+
+    num_lines, rest = 0, b''
+    while buf := in_fh.read(size):
+        # Work on whole lines, keep any partial line for the next block
+        buf = rest + buf
+        end = buf.rfind(b'\n') + 1
+        if end:
+            out_fh.write(fastq_lines(buf[:end], num_lines))
+            num_lines += buf.count(b'\n', 0, end)
+        rest = buf[end:]
+
+    if rest:
+        out_fh.write(fastq_lines(rest, num_lines))
+        num_lines += 1
+
+    return (num_lines + 3) // 4
+
+
+# --------------------------------------------------
+def fastq_lines(buf: bytes, line_num: int) -> bytes:
+    """ Transcribe the sequence lines in whole FASTQ lines """
+
+    # Only the second line of every four-line record is sequence
+    lines = buf.split(b'\n')
+    first = (1 - line_num) % 4
+    lines[first::4] = [line.translate(DNA_TO_RNA) for line in lines[first::4]]
+    return b'\n'.join(lines)
+
+
+# --------------------------------------------------
+def test_transcribe_fastq() -> None:
+    """ Test transcribe_fastq """
+
+    fastq = b'@T1\nTTAC\n+T1\nTTT@\n@T2\nGTT\n+\n@T>\n'
+    fastq_rna = b'@T1\nUUAC\n+T1\nTTT@\n@T2\nGUU\n+\n@T>\n'
+    for dna, rna, num in [(b'', b'', 0), (fastq, fastq_rna, 2),
+                          (fastq.rstrip(), fastq_rna.rstrip(), 2)]:
+        for size in [1, 2, 5, BUFSIZE]:
+            out_fh = io.BytesIO()
+            assert transcribe_fastq(io.BytesIO(dna), out_fh, size) == num
+            assert out_fh.getvalue() == rna
+
+
+TRANSCRIBERS: Dict[str, Callable[[BinaryIO, BinaryIO, int], int]] = {
+    'txt': transcribe,
+    'fasta': transcribe_fasta,
+    'fastq': transcribe_fastq,
+}
+
+
+# --------------------------------------------------
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+""" Tests for the options only solution3_bytes_translate.py has """
+
+import os
+import platform
+import shutil
+import tempfile
+from subprocess import getstatusoutput
+
+PRG = './solution3_bytes_translate.py'
+RUN = f'python {PRG}' if platform.system() == 'Windows' else PRG
+INPUT1 = './tests/inputs/input1.txt'
+INPUT2 = './tests/inputs/input2.txt'
+INPUT3 = './tests/inputs/input3.txt'
+FASTA = './tests/inputs/input1.fa'
+FASTQ = './tests/inputs/input1.fq'
+
+
+# --------------------------------------------------
+def test_workers() -> None:
+    """ Worker processes write the same files """
+
+    out_dir1, out_dir2 = tempfile.mkdtemp(), tempfile.mkdtemp()
+    try:
+        inputs = f'{INPUT1} {INPUT2} {INPUT3}'
+        rv, out = getstatusoutput(f'{RUN} -o {out_dir1} {inputs}')
+        assert rv == 0
+        assert out == (f'Done, wrote 5 sequences in 3 files to '
+                       f'directory "{out_dir1}".')
+
+        rv, out = getstatusoutput(f'{RUN} -w 2 -o {out_dir2} {inputs}')
+        assert rv == 0
+        assert out == (f'Done, wrote 5 sequences in 3 files to '
+                       f'directory "{out_dir2}".')
+
+        for file in ['input1.txt', 'input2.txt', 'input3.txt']:
+            assert read(os.path.join(out_dir1, file)) == read(
+                os.path.join(out_dir2, file))
+
+    finally:
+        shutil.rmtree(out_dir1)
+        shutil.rmtree(out_dir2)
+
+
+# --------------------------------------------------
+def test_bad_workers() -> None:
+    """ Dies on bad --workers """
+
+    rv, out = getstatusoutput(f'{RUN} -w 0 {INPUT1}')
+    assert rv != 0
+    assert out.lower().startswith('usage:')
+    assert '--workers "0" must be greater than 0' in out
+
+
+# --------------------------------------------------
+def test_same_name() -> None:
+    """ Dies on inputs that would write the same output file """
+
+    rv, out = getstatusoutput(f'{RUN} -w 2 -o out {INPUT1} ./{INPUT1}')
+    assert rv != 0
+    assert out.lower().startswith('usage:')
+    assert f'"{INPUT1}" and "./{INPUT1}" would both be written to ' \
+        '"out/input1.txt"' in out
+
+
+# --------------------------------------------------
+def test_fasta() -> None:
+    """ Leaves FASTA headers alone """
+
+    out_dir = tempfile.mkdtemp()
+    try:
+        rv, out = getstatusoutput(f'{RUN} -f fasta -o {out_dir} {FASTA}')
+        assert rv == 0
+        assert out == (f'Done, wrote 2 sequences in 1 file to '
+                       f'directory "{out_dir}".')
+        assert read(os.path.join(out_dir, 'input1.fa')) == '\n'.join([
+            '>seq1 TATA box', 'GAUGGAACUUGACU', 'ACGUAAAUU', '>seq2',
+            'UUAGCCCAGACUAGGACUUU', ''
+        ])
+
+    finally:
+        shutil.rmtree(out_dir)
+
+
+# --------------------------------------------------
+def test_fastq() -> None:
+    """ Leaves FASTQ headers and qualities alone """
+
+    out_dir = tempfile.mkdtemp()
+    try:
+        rv, out = getstatusoutput(f'{RUN} --format fastq -o {out_dir} {FASTQ}')
+        assert rv == 0
+        assert out == (f'Done, wrote 2 sequences in 1 file to '
+                       f'directory "{out_dir}".')
+        assert read(os.path.join(out_dir, 'input1.fq')) == '\n'.join([
+            '@seq1 TATA box', 'GAUGGAACUUGACUACGUAAAUU', '+seq1 TATA box',
+            'IIIIIIIIIIIIIIIIIIIITTT', '@seq2', 'UUAGCCCAGACUAGGACUUU', '+',
+            'TTTTIIIIIIIIIIIIIIII', ''
+        ])
+
+    finally:
+        shutil.rmtree(out_dir)
+
+
+# --------------------------------------------------
+def test_bad_format() -> None:
+    """ Dies on bad --format """
+
+    rv, out = getstatusoutput(f'{RUN} -f bam {FASTQ}')
+    assert rv != 0
+    assert out.lower().startswith('usage:')
+    assert "invalid choice: 'bam'" in out
+
+
+# --------------------------------------------------
+def read(file: str) -> str:
+    """ Read a whole file """
+
+    with open(file, encoding='utf-8') as fh:
+        return fh.read()
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+""" Vectorized reverse complement and canonical k-mers """
+
+import argparse
+import random
+import timeit
+from typing import List, NamedTuple, Sequence
+from Bio import Seq
+import numpy as np
+
+# The same table as the str.translate() solution, as a lookup array
+COMPLEMENT = np.frombuffer(
+    bytes(range(256)).translate(bytes.maketrans(b'ACGTacgt', b'TGCAtgca')),
+    dtype=np.uint8)
+
+# 2-bit codes for the bases, anything else is 4
+CODES = np.full(256, 4, dtype=np.uint8)
+for code, base in enumerate('ACGT'):
+    CODES[ord(base)] = CODES[ord(base.lower())] = code
+
+# The longest k-mer that fits in a uint64 code
+MAX_K = 32
+
+
+class Args(NamedTuple):
+    """ Command-line arguments """
+    seq_len: int
+    k: int
+    seed: int
+
+
+# --------------------------------------------------
+def get_args() -> Args:
+    """ Get command-line arguments """
+
+    parser = argparse.ArgumentParser(
+        description='Benchmark batch reverse complement of k-mers',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+
+    parser.add_argument('-l',
+                        '--len',
+                        metavar='int',
+                        type=int,
+                        default=100000,
+                        help='Sequence length')
+
+    parser.add_argument('-k',
+                        '--kmer',
+                        metavar='int',
+                        type=int,
+                        default=21,
+                        help='Size of k-mers')
+
+    parser.add_argument('-s',
+                        '--seed',
+                        metavar='int',
+                        type=int,
+                        default=1,
+                        help='Random seed')
+
+    args = parser.parse_args()
+
+    if not 1 <= args.kmer <= MAX_K:
+        parser.error(f'-k "{args.kmer}" must be between 1 and {MAX_K}')
+
+    if args.len < args.kmer:
+        parser.error(f'--len "{args.len}" must be at least -k "{args.kmer}"')
+
+    return Args(args.len, args.kmer, args.seed)
+
+
+# --------------------------------------------------
+def main() -> None:
+    """ Make a jazz noise here """
+
+    args = get_args()
+
+    random.seed(args.seed)
+    seq = ''.join(random.choices('ACGT', k=args.seq_len))
+    k = args.k
+    kmers = [seq[i:i + k] for i in range(len(seq) - k + 1)]
+
+    def bio() -> List[str]:
+        return [min(kmer, Seq.reverse_complement(kmer)) for kmer in kmers]
+
+    def batch() -> List[str]:
+        return [min(pair) for pair in zip(kmers, revcomp_kmers(kmers))]
+
+    def codes() -> np.ndarray:
+        return canonical_kmers(seq.encode(), k)
+
+    assert bio() == batch() == decode(codes(), k)
+
+    print(f'{len(kmers):,} {k}-mers')
+    for name, func in [('Bio.Seq.reverse_complement', bio),
+                       ('revcomp_kmers', batch), ('canonical_kmers', codes)]:
+        secs = min(timeit.repeat(func, number=1, repeat=3))
+        print(f'{name:30} {secs:10.4f}s {len(kmers) / secs:15,.0f} k-mers/s')
+
+
+# --------------------------------------------------
+def to_array(kmers: Sequence[str]) -> np.ndarray:
+    """ Pack equal-length k-mers into a 2-D array of ASCII codes """
+
+    k = len(kmers[0]) if kmers else 0
+    if any(len(kmer) != k for kmer in kmers):
+        raise ValueError('k-mers must all be the same length')
+
+    return np.frombuffer(''.join(kmers).encode(),
+                         dtype=np.uint8).reshape(len(kmers), k)
+
+
+# --------------------------------------------------
+def revcomp(seqs: np.ndarray) -> np.ndarray:
+    """ Reverse complement the last axis of an array of ASCII codes """
+
+    return COMPLEMENT[seqs][..., ::-1]
+
+
+# --------------------------------------------------
+def test_revcomp() -> None:
+    """ Test revcomp """
+
+    def run(seq: bytes) -> bytes:
+        return revcomp(np.frombuffer(seq, dtype=np.uint8)).tobytes()
+
+    assert run(b'') == b''
+    assert run(b'AAAACCCGGT') == b'ACCGGGTTTT'
+    assert run(b'aaaaCCCGGT') == b'ACCGGGtttt'
+    assert run(b'NACGT') == b'ACGTN'
+    assert revcomp(to_array(['AAC', 'GTT'])).tobytes() == b'GTTAAC'
+
+
+# --------------------------------------------------
+def revcomp_kmers(kmers: Sequence[str]) -> List[str]:
+    """ Reverse complement many equal-length k-mers at once """
+
+    if not kmers:
+        return []
+
+    k = len(kmers[0])
+    out = revcomp(to_array(kmers)).tobytes().decode()
+    return [out[i:i + k] for i in range(0, len(out), k)]
+
+
+# --------------------------------------------------
+def test_revcomp_kmers() -> None:
+    """ Test revcomp_kmers """
+
+    assert revcomp_kmers([]) == []
+    assert revcomp_kmers(['AAC', 'GTT', 'acg']) == ['GTT', 'AAC', 'cgt']
+
+    try:
+        revcomp_kmers(['AAC', 'GT'])
+        assert False
+    except ValueError:
+        pass
+
+
+# --------------------------------------------------
+def kmer_codes(kmers: np.ndarray) -> np.ndarray:
+    """ Encode a 2-D array of k-mers (k <= 32) as integers """
+
+    check_k(kmers.shape[-1])
+    out = np.zeros(kmers.shape[0], dtype=np.uint64)
+
+    # Roll in one column at a time, the first base ends in the highest bits
+    for column in kmers.T:
+        codes = CODES[column]
+        if (codes > 3).any():
+            raise ValueError('k-mers must contain only A, C, G, or T')
+        out <<= np.uint64(2)
+        out |= codes
+
+    return out
+
+
+# --------------------------------------------------
+def check_k(k: int) -> None:
+    """ Codes of longer k-mers would overflow a uint64 """
+
+    if k > MAX_K:
+        raise ValueError(f'k "{k}" must be at most {MAX_K}')
+
+
+# --------------------------------------------------
+def test_kmer_codes() -> None:
+    """ Test kmer_codes """
+
+    assert kmer_codes(to_array(['AAA', 'AAC', 'TTT'])).tolist() == [0, 1, 63]
+    assert kmer_codes(to_array(['acgt'])).tolist() == [27]
+
+    for bad in [['ANA'], ['A' * (MAX_K + 1)]]:
+        try:
+            kmer_codes(to_array(bad))
+            assert False
+        except ValueError:
+            pass
+
+
+# --------------------------------------------------
+def revcomp_codes(codes: np.ndarray, k: int) -> np.ndarray:
+    """ Reverse complement integer-encoded k-mers """
+
+    check_k(k)
+
+    # Complementing a 2-bit code is XOR with 3, then reverse the pairs
+    codes = codes ^ np.uint64(4**k - 1)
+    out = np.zeros_like(codes)
+    for _ in range(k):
+        out <<= np.uint64(2)
+        out |= codes & np.uint64(3)
+        codes >>= np.uint64(2)
+
+    return out
+
+
+# --------------------------------------------------
+def test_revcomp_codes() -> None:
+    """ Test revcomp_codes """
+
+    kmers = ['AAC', 'GTT', 'ACG', 'CGT', 'TTT']
+    codes = kmer_codes(to_array(kmers))
+    assert revcomp_codes(codes, 3).tolist() == kmer_codes(
+        to_array(revcomp_kmers(kmers))).tolist()
+
+    k = MAX_K
+    codes = kmer_codes(to_array(['A' * k, 'C' * (k - 1) + 'G']))
+    assert decode(revcomp_codes(codes, k), k) == ['T' * k, 'C' + 'G' * (k - 1)]
+
+    try:
+        revcomp_codes(codes, MAX_K + 1)
+        assert False
+    except ValueError:
+        pass
+
+
+# --------------------------------------------------
+def canonical(codes: np.ndarray, k: int) -> np.ndarray:
+    """ The smaller of each k-mer code and its reverse complement """
+
+    return np.minimum(codes, revcomp_codes(codes, k))
+
+
+# --------------------------------------------------
+def canonical_kmers(seq: bytes, k: int) -> np.ndarray:
+    """ Canonical codes of all the k-mers in a sequence, skipping non-ACGT """
+
+    check_k(k)
+    codes = CODES[np.frombuffer(seq, dtype=np.uint8)]
+    n = len(codes) - k + 1
+    if n < 1:
+        return np.empty(0, dtype=np.uint64)
+
+    # Roll each base into the codes of all the k-mers at once, so the
+    # memory grows with the length of the sequence and not with k
+    kmers = np.zeros(n, dtype=np.uint64)
+    invalid = np.zeros(n, dtype=bool)
+    for i in range(k):
+        window = codes[i:i + n]
+        kmers <<= np.uint64(2)
+        kmers |= window & 3
+        invalid |= window > 3
+
+    return canonical(kmers[~invalid], k)
+
+
+# --------------------------------------------------
+def test_canonical_kmers() -> None:
+    """ Test canonical_kmers """
+
+    assert canonical_kmers(b'AC', 3).tolist() == []
+    assert decode(canonical_kmers(b'AACGTT', 3), 3) == [
+        'AAC', 'ACG', 'ACG', 'AAC'
+    ]
+    assert decode(canonical_kmers(b'TTNGGG', 2), 2) == ['AA', 'CC', 'CC']
+
+    seq = b'ACGTTGCANACGGT' * 3
+    assert decode(canonical_kmers(seq, 5), 5) == [
+        min(kmer, revcomp_kmers([kmer])[0])
+        for kmer in (seq[i:i + 5].decode() for i in range(len(seq) - 4))
+        if 'N' not in kmer
+    ]
+
+
+# --------------------------------------------------
+def decode(codes: np.ndarray, k: int) -> List[str]:
+    """ Turn integer codes back into k-mers """
+
+    shifts = np.arange(2 * (k - 1), -1, -2, dtype=np.uint64)
+    bases = (codes[:, None] >> shifts) & np.uint64(3)
+    out = np.frombuffer(b'ACGT', dtype=np.uint8)[bases].tobytes().decode()
+    return [out[i:i + k] for i in range(0, len(out), k)]
+
+
+# --------------------------------------------------
+def test_decode() -> None:
+    """ Test decode """
+
+    assert decode(np.array([], dtype=np.uint64), 3) == []
+    kmers = ['AAC', 'GTT', 'ACG']
+    assert decode(kmer_codes(to_array(kmers)), 3) == kmers
+
+
+# --------------------------------------------------
+if __name__ == '__main__':
+    main()
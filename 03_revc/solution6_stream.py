@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+""" Reverse complement """
+
+import argparse
+import io
+import os
+import sys
+from collections import deque
+from multiprocessing import Pool
+from typing import (BinaryIO, Deque, Iterable, Iterator, List, NamedTuple,
+                    Optional)
+
+# Read files in blocks of this many bytes
+BUFSIZE = 1024 * 1024
+
+# Complement table for bytes.translate() and the line endings to remove
+COMPLEMENT = bytes.maketrans(b'ACGTacgt', b'TGCAtgca')
+NEWLINES = b'\r\n'
+
+# Send FASTA records to the workers in batches of about this many bases
+BATCH_SIZE = 4 * 1024 * 1024
+
+
+class Args(NamedTuple):
+    """ Command-line arguments """
+    dna: str
+    workers: int
+
+
+class Record(NamedTuple):
+    """ A FASTA record and the line width of its sequence """
+    header: bytes
+    seq: bytes
+    width: int
+
+
+# --------------------------------------------------
+def get_args() -> Args:
+    """ Get command-line arguments """
+
+    parser = argparse.ArgumentParser(
+        description='Print the reverse complement of DNA',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+
+    parser.add_argument('dna',
+                        metavar='DNA',
+                        help='Input sequence or file (raw or FASTA)')
+
+    parser.add_argument('-w',
+                        '--workers',
+                        metavar='int',
+                        type=int,
+                        default=1,
+                        help='Number of worker processes for FASTA input')
+
+    args = parser.parse_args()
+
+    if args.workers < 1:
+        parser.error(f'--workers "{args.workers}" must be greater than 0')
+
+    # Do not read a file argument here; it will be streamed
+    return Args(args.dna, args.workers)
+
+
+# --------------------------------------------------
+def main() -> None:
+    """ Make a jazz noise here """
+
+    args = get_args()
+    out_fh = sys.stdout.buffer
+
+    if not os.path.isfile(args.dna):
+        out_fh.write(revcomp(args.dna.encode()) + b'\n')
+        return
+
+    with open(args.dna, 'rb') as fh:
+        is_fasta = fh.read(1) == b'>'
+        fh.seek(0)
+        if is_fasta:
+            revcomp_fasta(fh, out_fh, args.workers)
+        else:
+            revcomp_fh(fh, out_fh)
+            out_fh.write(b'\n')
+
+
+# --------------------------------------------------
+def revcomp(dna: bytes) -> bytes:
+    """ Reverse complement a buffer of DNA, removing line endings """
+
+    return dna[::-1].translate(COMPLEMENT, NEWLINES)
+
+
+# --------------------------------------------------
+def test_revcomp() -> None:
+    """ Test revcomp """
+
+    assert revcomp(b'') == b''
+    assert revcomp(b'AAAACCCGGT') == b'ACCGGGTTTT'
+    assert revcomp(b'aaaaCCCGGT') == b'ACCGGGtttt'
+    assert revcomp(b'AAAA\nCC\r\n') == b'GGTTTT'
+
+
+# --------------------------------------------------
+def revcomp_fh(fh: BinaryIO, out_fh: BinaryIO, size: int = BUFSIZE) -> None:
+    """ Reverse complement a file by reading blocks from the end """
+
+    end = fh.seek(0, os.SEEK_END)
+    while end > 0:
+        start = max(0, end - size)
+        fh.seek(start)
+        out_fh.write(revcomp(fh.read(end - start)))
+        end = start
+
+
+# --------------------------------------------------
+def test_revcomp_fh() -> None:
+    """ Test revcomp_fh """
+
+    dna = b'AGCTTTTCATTCTGACTGCAACGG\nGCAATATGTCTCTGTGTGGATTAAA\n'
+    for size in [1, 2, 3, 7, BUFSIZE]:
+        out_fh = io.BytesIO()
+        revcomp_fh(io.BytesIO(dna), out_fh, size)
+        assert out_fh.getvalue() == revcomp(dna)
+
+    out_fh = io.BytesIO()
+    revcomp_fh(io.BytesIO(b''), out_fh)
+    assert out_fh.getvalue() == b''
+
+
+# --------------------------------------------------
+def read_fasta(fh: BinaryIO) -> Iterator[Record]:
+    """ Read FASTA records, noting the width of the sequence lines """
+
+    header: Optional[bytes] = None
+    lines: List[bytes] = []
+
+    for line in fh:
+        line = line.rstrip(NEWLINES)
+        if line.startswith(b'>'):
+            if header is not None:
+                yield Record(header, b''.join(lines), max(map(len, lines),
+                                                          default=0))
+            header, lines = line, []
+        elif line:
+            lines.append(line)
+
+    if header is not None:
+        yield Record(header, b''.join(lines), max(map(len, lines), default=0))
+
+
+# --------------------------------------------------
+def test_read_fasta() -> None:
+    """ Test read_fasta """
+
+    assert not list(read_fasta(io.BytesIO(b'')))
+    fasta = b'>a desc\nACG\nT\n>b\n\n>c\r\nAA\r\nCC\r\nG'
+    assert list(read_fasta(io.BytesIO(fasta))) == [
+        Record(b'>a desc', b'ACGT', 3),
+        Record(b'>b', b'', 0),
+        Record(b'>c', b'AACCG', 2),
+    ]
+
+
+# --------------------------------------------------
+def split_record(rec: Record, size: int = BATCH_SIZE) -> Iterator[Record]:
+    """ Split a long record into line-aligned pieces in output order """
+
+    # Cut from the end so every piece but the last reverse complements to
+    # whole lines; only the first piece keeps the header
+    step = max(1, rec.width) * max(1, size // max(1, rec.width))
+    if len(rec.seq) <= step:
+        yield rec
+        return
+
+    header = rec.header
+    for end in range(len(rec.seq), 0, -step):
+        yield Record(header, rec.seq[max(0, end - step):end], rec.width)
+        header = b''
+
+
+# --------------------------------------------------
+def test_split_record() -> None:
+    """ Test split_record """
+
+    rec = Record(b'>a', b'AACCGGTTA', 2)
+    assert list(split_record(rec)) == [rec]
+    assert list(split_record(rec, 10)) == [rec]
+    assert list(split_record(rec, 4)) == [
+        Record(b'>a', b'GTTA', 2),
+        Record(b'', b'ACCG', 2),
+        Record(b'', b'A', 2),
+    ]
+    assert list(split_record(rec, 5)) == list(split_record(rec, 4))
+    assert list(split_record(rec, 1)) == list(split_record(rec, 2))
+    assert list(split_record(Record(b'>b', b'', 0), 1)) == \
+        [Record(b'>b', b'', 0)]
+
+
+# --------------------------------------------------
+def batches(records: Iterable[Record],
+            size: int = BATCH_SIZE) -> Iterator[List[Record]]:
+    """ Group small records together, split large records into pieces """
+
+    batch: List[Record] = []
+    num_bases = 0
+    for rec in records:
+        for piece in split_record(rec, size):
+            if batch and num_bases + len(piece.seq) > size:
+                yield batch
+                batch, num_bases = [], 0
+            batch.append(piece)
+            num_bases += len(piece.seq)
+
+    if batch:
+        yield batch
+
+
+# --------------------------------------------------
+def test_batches() -> None:
+    """ Test batches """
+
+    recs = [Record(b'>a', b'AAA', 3), Record(b'>b', b'C', 1),
+            Record(b'>c', b'GGGGGG', 6), Record(b'>d', b'T', 1)]
+    assert not list(batches([]))
+    assert list(batches(recs)) == [recs]
+    assert list(batches(recs, 4)) == [recs[:2], recs[2:3], recs[3:]]
+    assert list(batches([Record(b'>e', b'GGGGGA', 2)], 4)) == [
+        [Record(b'>e', b'GGGA', 2)], [Record(b'', b'GG', 2)]
+    ]
+
+
+# --------------------------------------------------
+def format_batch(batch: List[Record]) -> bytes:
+    """ Reverse complement a batch of records, keeping the line widths """
+
+    out = []
+    for rec in batch:
+        # Pieces after the first of a split record have no header
+        if rec.header:
+            out.append(rec.header + b'\n')
+        seq = revcomp(rec.seq)
+        for start in range(0, len(seq), rec.width or 1):
+            out.append(seq[start:start + rec.width] + b'\n')
+
+    return b''.join(out)
+
+
+# --------------------------------------------------
+def test_format_batch() -> None:
+    """ Test format_batch """
+
+    assert format_batch([]) == b''
+    assert format_batch([Record(b'>a', b'', 0)]) == b'>a\n'
+    assert format_batch([Record(b'>a', b'AACCG', 2),
+                         Record(b'>b x', b'TTTA', 4)]) == \
+        b'>a\nCG\nGT\nT\n>b x\nTAAA\n'
+    assert format_batch([Record(b'', b'AACC', 2)]) == b'GG\nTT\n'
+
+
+# --------------------------------------------------
+def revcomp_fasta(fh: BinaryIO,
+                  out_fh: BinaryIO,
+                  workers: int = 1,
+                  size: int = BATCH_SIZE) -> None:
+    """ Reverse complement each FASTA record, writing them in order """
+
+    jobs = batches(read_fasta(fh), size)
+
+    if workers == 1:
+        for batch in jobs:
+            out_fh.write(format_batch(batch))
+        return
+
+    # Keep a few batches in flight so the reader cannot run far ahead
+    with Pool(workers) as pool:
+        pending: Deque = deque()
+        for batch in jobs:
+            pending.append(pool.apply_async(format_batch, (batch, )))
+            if len(pending) >= 2 * workers:
+                out_fh.write(pending.popleft().get())
+
+        while pending:
+            out_fh.write(pending.popleft().get())
+
+
+# --------------------------------------------------
+def test_revcomp_fasta() -> None:
+    """ Test revcomp_fasta """
+
+    fasta = b'>a\nAACCG\nTT\n>b\nGATTACA\n'
+    expected = b'>a\nAACGG\nTT\n>b\nTGTAATC\n'
+    for workers in [1, 2]:
+        out_fh = io.BytesIO()
+        revcomp_fasta(io.BytesIO(fasta), out_fh, workers)
+        assert out_fh.getvalue() == expected
+
+    # Records longer than a batch are split, and the pieces written in
+    # reverse order
+    fasta = b'>a\nAACCGTT\nGATTACA\nG\n'
+    for size in [1, 7, 8, 14, 15]:
+        out_fh = io.BytesIO()
+        revcomp_fasta(io.BytesIO(fasta), out_fh, 2, size)
+        assert out_fh.getvalue() == b'>a\nCTGTAAT\nCAACGGT\nT\n'
+
+
+# --------------------------------------------------
+if __name__ == '__main__':
+    main()
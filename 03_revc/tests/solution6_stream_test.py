@@ -0,0 +1,30 @@
+""" Tests for the options only solution6_stream.py has """
+
+import platform
+from subprocess import getstatusoutput
+
+PRG = './solution6_stream.py'
+RUN = f'python {PRG}' if platform.system() == 'Windows' else PRG
+FASTA = './tests/inputs/input1.fa'
+
+
+# --------------------------------------------------
+def test_fasta() -> None:
+    """ Reverse complements each record, keeping headers and line widths """
+
+    for workers in [1, 2]:
+        rv, out = getstatusoutput(f'{RUN} -w {workers} {FASTA}')
+        assert rv == 0
+        assert out.splitlines() == [
+            '>seq1 first', 'ACGTACCGGG', 'TTTT', '>seq2', 'TGTAATC'
+        ]
+
+
+# --------------------------------------------------
+def test_bad_workers() -> None:
+    """ Dies on bad --workers """
+
+    rv, out = getstatusoutput(f'{RUN} -w 0 {FASTA}')
+    assert rv != 0
+    assert out.lower().startswith('usage:')
+    assert '--workers "0" must be greater than 0' in out
@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+""" Rabbit populations for any number of generations """
+
+import argparse
+import io
+import sys
+from collections import deque
+from functools import lru_cache
+from typing import Callable, Deque, List, NamedTuple, Optional, TextIO, Tuple
+
+# A 2x2 matrix stored by rows as (a, b, c, d)
+Matrix = Tuple[int, int, int, int]
+
+# A square matrix of any size stored as a list of rows
+SquareMatrix = List[List[int]]
+
+
+class Args(NamedTuple):
+    """ Command-line arguments """
+    generations: int
+    litter: int
+    modulo: Optional[int]
+    batch: Optional[TextIO]
+    cache_size: int
+    months: Optional[int]
+
+
+# --------------------------------------------------
+def get_args() -> Args:
+    """ Get command-line arguments """
+
+    parser = argparse.ArgumentParser(
+        description='Rabbit populations for any number of generations',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+
+    parser.add_argument('gen',
+                        metavar='generations',
+                        type=int,
+                        nargs='?',
+                        help='Number of generations')
+
+    parser.add_argument('litter',
+                        metavar='litter',
+                        type=int,
+                        nargs='?',
+                        help='Size of litter per generation')
+
+    parser.add_argument('-m',
+                        '--modulo',
+                        metavar='int',
+                        type=int,
+                        help='Report the population modulo this number')
+
+    parser.add_argument('-b',
+                        '--batch',
+                        metavar='FILE',
+                        type=argparse.FileType('rt'),
+                        help='File of "generations litter" queries, '
+                        '"-" for STDIN')
+
+    parser.add_argument('-c',
+                        '--cache_size',
+                        metavar='int',
+                        type=int,
+                        default=4096,
+                        help='Most matrix powers to cache in batch mode')
+
+    parser.add_argument('-M',
+                        '--months',
+                        metavar='int',
+                        type=int,
+                        help='Rabbits die after this many months')
+
+    args = parser.parse_args()
+
+    if args.batch is None:
+        if args.gen is None or args.litter is None:
+            parser.error('generations and litter are required without --batch')
+
+        if args.gen < 1:
+            parser.error(f'generations "{args.gen}" must be greater than 0')
+
+        if args.litter < 1:
+            parser.error(f'litter "{args.litter}" must be greater than 0')
+
+    if args.modulo is not None and args.modulo < 1:
+        parser.error(f'--modulo "{args.modulo}" must be greater than 0')
+
+    if args.months is not None:
+        if args.months < 1:
+            parser.error(f'--months "{args.months}" must be greater than 0')
+
+        if args.batch:
+            parser.error('--months cannot be used with --batch')
+
+    if args.cache_size < 1:
+        parser.error(f'--cache_size "{args.cache_size}" must be positive')
+
+    return Args(generations=args.gen,
+                litter=args.litter,
+                modulo=args.modulo,
+                batch=args.batch,
+                cache_size=args.cache_size,
+                months=args.months)
+
+
+# --------------------------------------------------
+def main() -> None:
+    """ Make a jazz noise here """
+
+    args = get_args()
+
+    # Python limits how many digits an int may print by default
+    if hasattr(sys, 'set_int_max_str_digits'):
+        sys.set_int_max_str_digits(0)
+
+    if args.batch:
+        run_batch(args.batch, sys.stdout, args.cache_size, args.modulo)
+    elif args.months:
+        print(
+            fib_mortal(args.generations, args.months, args.litter,
+                       args.modulo))
+    else:
+        print(fib(args.generations, args.litter, args.modulo))
+
+
+# --------------------------------------------------
+def mat_mul(x: Matrix, y: Matrix, mod: Optional[int] = None) -> Matrix:
+    """ Multiply two 2x2 matrices, maybe modulo a number """
+
+    a, b, c, d = x
+    e, f, g, h = y
+    prod = (a * e + b * g, a * f + b * h, c * e + d * g, c * f + d * h)
+
+    return prod if mod is None else (prod[0] % mod, prod[1] % mod,
+                                     prod[2] % mod, prod[3] % mod)
+
+
+# --------------------------------------------------
+def test_mat_mul() -> None:
+    """ Test mat_mul """
+
+    identity = (1, 0, 0, 1)
+    assert mat_mul(identity, (1, 2, 3, 4)) == (1, 2, 3, 4)
+    assert mat_mul((1, 2, 3, 4), (5, 6, 7, 8)) == (19, 22, 43, 50)
+    assert mat_mul((1, 2, 3, 4), (5, 6, 7, 8), 10) == (9, 2, 3, 0)
+
+
+# --------------------------------------------------
+def mat_pow(x: Matrix, n: int, mod: Optional[int] = None) -> Matrix:
+    """ Raise a 2x2 matrix to a power by repeated squaring """
+
+    result = (1, 0, 0, 1) if mod != 1 else (0, 0, 0, 0)
+    while n:
+        if n & 1:
+            result = mat_mul(result, x, mod)
+        x = mat_mul(x, x, mod)
+        n >>= 1
+
+    return result
+
+
+# --------------------------------------------------
+def test_mat_pow() -> None:
+    """ Test mat_pow """
+
+    assert mat_pow((1, 2, 3, 4), 0) == (1, 0, 0, 1)
+    assert mat_pow((1, 2, 3, 4), 1) == (1, 2, 3, 4)
+    assert mat_pow((1, 2, 3, 4), 3) == (37, 54, 81, 118)
+    assert mat_pow((1, 2, 3, 4), 3, 10) == (7, 4, 1, 8)
+    assert mat_pow((1, 2, 3, 4), 3, 1) == (0, 0, 0, 0)
+
+
+# --------------------------------------------------
+def fib(n: int, litter: int = 1, mod: Optional[int] = None) -> int:
+    """ Pairs of rabbits after n generations in O(log n) steps """
+
+    # [[1, k], [1, 0]] ** n == [[F(n+1), k*F(n)], [F(n), k*F(n-1)]]
+    return mat_pow((1, litter, 1, 0), n, mod)[2]
+
+
+# --------------------------------------------------
+def test_fib() -> None:
+    """ Test fib """
+
+    assert [fib(n) for n in range(1, 11)] == [1, 1, 2, 3, 5, 8, 13, 21, 34, 55]
+    assert fib(5, 3) == 19
+    assert fib(30, 4) == 436390025825
+    assert fib(29, 2) == 178956971
+    assert fib(100) == 354224848179261915075
+    assert fib(100, 1, 1000) == 75
+    assert fib(10**4, 5, 10**9 + 7) == fib(10**4, 5) % (10**9 + 7)
+
+
+# --------------------------------------------------
+def make_square(maxsize: int,
+                mod: Optional[int] = None) -> Callable[[int, int], Matrix]:
+    """ Cache the powers M**(2**i) of each litter's matrix, LRU first out """
+
+    def square(litter: int, i: int) -> Matrix:
+        if i == 0:
+            return mat_pow((1, litter, 1, 0), 1, mod)
+        prev = cached(litter, i - 1)
+        return mat_mul(prev, prev, mod)
+
+    cached = lru_cache(maxsize=maxsize)(square)
+    return cached
+
+
+# --------------------------------------------------
+def fib_cached(n: int,
+               litter: int,
+               square: Callable[[int, int], Matrix],
+               mod: Optional[int] = None) -> int:
+    """ Like fib(), but multiply cached powers instead of squaring again """
+
+    result = (1, 0, 0, 1) if mod != 1 else (0, 0, 0, 0)
+    i = 0
+    while n:
+        if n & 1:
+            result = mat_mul(result, square(litter, i), mod)
+        n >>= 1
+        i += 1
+
+    return result[2]
+
+
+# --------------------------------------------------
+def test_fib_cached() -> None:
+    """ Test fib_cached """
+
+    square = make_square(100)
+    for n in range(1, 50):
+        for litter in range(1, 6):
+            assert fib_cached(n, litter, square) == fib(n, litter)
+
+    square = make_square(100, 1000)
+    assert fib_cached(100, 1, square, 1000) == 75
+
+    # Only the 2 most recent powers are kept
+    square = make_square(2)
+    assert fib_cached(7, 1, square) == 13
+    assert square.cache_info().currsize == 2  # type: ignore
+
+
+# --------------------------------------------------
+def run_batch(in_fh: TextIO,
+              out_fh: TextIO,
+              cache_size: int,
+              mod: Optional[int] = None) -> None:
+    """ Answer one query per line, reporting the cache hit rate """
+
+    square = make_square(cache_size, mod)
+    num_queries = 0
+
+    for line_num, line in enumerate(in_fh, start=1):
+        if not line.strip() or line.startswith('#'):
+            continue
+
+        try:
+            gen, litter = map(int, line.split())
+            if gen < 1 or litter < 1:
+                raise ValueError()
+        except ValueError:
+            sys.exit(f'Bad query on line {line_num}: "{line.rstrip()}"')
+
+        num_queries += 1
+        print(fib_cached(gen, litter, square, mod), file=out_fh)
+
+    info = square.cache_info()  # type: ignore
+    lookups = info.hits + info.misses
+    print(f'Answered {num_queries:,} quer{"y" if num_queries == 1 else "ies"}'
+          f', cache hits {info.hits:,} of {lookups:,} '
+          f'({info.hits / lookups if lookups else 0:.1%}).',
+          file=sys.stderr)
+
+
+# --------------------------------------------------
+def test_run_batch() -> None:
+    """ Test run_batch """
+
+    out_fh = io.StringIO()
+    run_batch(io.StringIO('5 3\n\n# comment\n30 4\n29 2\n5 3\n'), out_fh, 10)
+    assert out_fh.getvalue().split() == [
+        '19', '436390025825', '178956971', '19'
+    ]
+
+
+# --------------------------------------------------
+def fib_mortal(n: int,
+               months: int,
+               litter: int = 1,
+               mod: Optional[int] = None) -> int:
+    """ Pairs of rabbits after n generations when they live for months """
+
+    # The matrix costs O(m**3 log n), stepping through the months O(n)
+    if months**3 * n.bit_length() < n:
+        return mortal_matrix(n, months, litter, mod)
+
+    return mortal_ring(n, months, litter, mod)
+
+
+# --------------------------------------------------
+def test_fib_mortal() -> None:
+    """ Test fib_mortal """
+
+    assert fib_mortal(6, 3) == 4
+    assert fib_mortal(5, 1) == 0
+    assert fib_mortal(30, 40, 4) == fib(30, 4)
+    assert fib_mortal(10**5, 3, 1, 10**9 + 7) == mortal_ring(
+        10**5, 3, 1, 10**9 + 7)
+
+
+# --------------------------------------------------
+def mortal_ring(n: int,
+                months: int,
+                litter: int = 1,
+                mod: Optional[int] = None) -> int:
+    """ Step through the months keeping only the pairs of each age """
+
+    # ages[0] are the newborns, ages[-1] die at the end of the month
+    ages: Deque[int] = deque([1] + [0] * (months - 1), maxlen=months)
+    total = 1
+    for _ in range(n - 1):
+        births = litter * (total - ages[0])
+        total += births - ages[-1]
+        if mod is not None:
+            births, total = births % mod, total % mod
+        ages.appendleft(births)
+
+    return total if mod is None else total % mod
+
+
+# --------------------------------------------------
+def test_mortal_ring() -> None:
+    """ Test mortal_ring """
+
+    assert [mortal_ring(n, 3) for n in range(1, 9)] == [1, 1, 2, 2, 3, 4, 5, 7]
+    assert mortal_ring(1, 1) == 1
+    assert mortal_ring(2, 1) == 0
+    assert mortal_ring(82, 16) == 60467010349760561
+    assert mortal_ring(82, 16, 1, 1000) == 60467010349760561 % 1000
+    assert mortal_ring(29, 30, 2) == fib(29, 2)
+
+
+# --------------------------------------------------
+def sq_mat_mul(x: SquareMatrix,
+               y: SquareMatrix,
+               mod: Optional[int] = None) -> SquareMatrix:
+    """ Multiply two square matrices, maybe modulo a number """
+
+    cols = list(zip(*y))
+    prod = [[sum(a * b for a, b in zip(row, col)) for col in cols]
+            for row in x]
+
+    return prod if mod is None else [[v % mod for v in row] for row in prod]
+
+
+# --------------------------------------------------
+def mortal_matrix(n: int,
+                  months: int,
+                  litter: int = 1,
+                  mod: Optional[int] = None) -> int:
+    """ Raise the companion matrix of the age classes to a power """
+
+    # Pairs of age 1 or more breed, everyone else gets a month older
+    step = [[0] + [litter] * (months - 1)]
+    step += [[int(col == row - 1) for col in range(months)]
+             for row in range(1, months)]
+
+    result = [[int(row == col) for col in range(months)]
+              for row in range(months)]
+    power = n - 1
+    while power:
+        if power & 1:
+            result = sq_mat_mul(result, step, mod)
+        step = sq_mat_mul(step, step, mod)
+        power >>= 1
+
+    # Start with one newborn pair, so the answer is the first column
+    total = sum(row[0] for row in result)
+    return total if mod is None else total % mod
+
+
+# --------------------------------------------------
+def test_mortal_matrix() -> None:
+    """ Test mortal_matrix """
+
+    for months in range(1, 6):
+        for litter in range(1, 4):
+            for n in range(1, 30):
+                assert mortal_matrix(n, months,
+                                     litter) == mortal_ring(n, months, litter)
+
+    assert mortal_matrix(82, 16, 1, 1000) == 60467010349760561 % 1000
+
+
+# --------------------------------------------------
+if __name__ == '__main__':
+    main()
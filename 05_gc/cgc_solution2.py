@@ -46,8 +46,8 @@ def main() -> None:
     highest = ['', 0.]
 
     for fasta in recs:
-        if find_gc(fasta) > highest[1]:
-            highest = [fasta.id, find_gc(fasta)]
+        if (gc := find_gc(str(fasta.seq))) > highest[1]:
+            highest = [fasta.id, gc]
 
     print(f"{highest[0]} {highest[1]:.6f}")
 
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+""" Sliding-window GC content and GC skew as bedGraph """
+
+import argparse
+import io
+import sys
+from typing import NamedTuple, TextIO
+from Bio import SeqIO
+import numpy as np
+
+# Masks of the bases to count, indexed by ASCII code
+IS_G = np.zeros(256, dtype=bool)
+IS_G[[ord('G'), ord('g')]] = True
+IS_GC = IS_G.copy()
+IS_GC[[ord('C'), ord('c')]] = True
+
+# Count the bases in blocks of this size
+BLOCK = 1024 * 1024
+
+
+class Args(NamedTuple):
+    """ Command-line arguments """
+    file: TextIO
+    outfile: TextIO
+    window: int
+    step: int
+    skew: bool
+
+
+class Windows(NamedTuple):
+    """ Window coordinates and the value for each """
+    starts: np.ndarray
+    ends: np.ndarray
+    values: np.ndarray
+
+
+# --------------------------------------------------
+def get_args() -> Args:
+    """ Get command-line arguments """
+
+    parser = argparse.ArgumentParser(
+        description='Sliding-window GC content and GC skew as bedGraph',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+
+    parser.add_argument('file',
+                        metavar='FILE',
+                        type=argparse.FileType('rt'),
+                        nargs='?',
+                        default=sys.stdin,
+                        help='Input FASTA file')
+
+    parser.add_argument('-o',
+                        '--outfile',
+                        metavar='FILE',
+                        type=argparse.FileType('wt'),
+                        default=sys.stdout,
+                        help='Output file')
+
+    parser.add_argument('-w',
+                        '--window',
+                        metavar='int',
+                        type=int,
+                        default=1000,
+                        help='Window size')
+
+    parser.add_argument('-s',
+                        '--step',
+                        metavar='int',
+                        type=int,
+                        default=1000,
+                        help='Distance between window starts')
+
+    parser.add_argument('-k',
+                        '--skew',
+                        action='store_true',
+                        help='Report GC skew (G-C)/(G+C) instead of GC%%')
+
+    args = parser.parse_args()
+
+    if args.window < 1:
+        parser.error(f'--window "{args.window}" must be greater than 0')
+
+    if args.step < 1:
+        parser.error(f'--step "{args.step}" must be greater than 0')
+
+    return Args(args.file, args.outfile, args.window, args.step, args.skew)
+
+
+# --------------------------------------------------
+def main() -> None:
+    """ Make a jazz noise here """
+
+    args = get_args()
+
+    # Write each record's track as soon as it is computed
+    for rec in SeqIO.parse(args.file, 'fasta'):
+        windows = gc_windows(bytes(rec.seq), args.window, args.step,
+                             args.skew)
+        write_bedgraph(args.outfile, rec.id, windows)
+
+
+# --------------------------------------------------
+def prefix_sums(seq: bytes, mask: np.ndarray) -> np.ndarray:
+    """ Running count of the masked bases, starting with 0 before the first """
+
+    bases = np.frombuffer(seq, dtype=np.uint8)
+
+    # Counts of a sequence under 4 Gbp fit in half the memory of int64
+    dtype = np.uint32 if len(bases) < 2**32 else np.uint64
+    sums = np.zeros(len(bases) + 1, dtype=dtype)
+
+    # cumsum() casts its whole input to the output type first, so go a
+    # block at a time and carry the count over
+    for start in range(0, len(bases), BLOCK):
+        block = sums[start + 1:start + BLOCK + 1]
+        np.cumsum(mask[bases[start:start + BLOCK]], dtype=dtype, out=block)
+        np.add(block, sums[start], out=block)
+
+    return sums
+
+
+# --------------------------------------------------
+def test_prefix_sums() -> None:
+    """ Test prefix_sums """
+
+    assert prefix_sums(b'', IS_GC).tolist() == [0]
+    assert prefix_sums(b'GaCgcN', IS_G).tolist() == [0, 1, 1, 1, 2, 2, 2]
+    assert prefix_sums(b'GaCgcN', IS_GC).tolist() == [0, 1, 1, 2, 3, 4, 4]
+    assert prefix_sums(b'GC', IS_GC).dtype == np.uint32
+
+    seq = b'GATTACA' * (BLOCK // 3)
+    assert prefix_sums(seq, IS_G).tolist() == np.cumsum(
+        [0] + [base == ord('G') for base in seq]).tolist()
+
+
+# --------------------------------------------------
+def gc_windows(seq: bytes,
+               window: int,
+               step: int,
+               skew: bool = False) -> Windows:
+    """
+    GC% or GC skew in each full window, then one shorter window for any
+    bases at the end that no full window reaches
+    """
+
+    num_full = (len(seq) - window) // step + 1 if len(seq) >= window else 0
+    starts = np.arange(num_full, dtype=np.int64) * step
+    last_end = int(starts[-1]) + window if num_full else 0
+    if last_end < len(seq):
+        starts = np.append(starts, num_full * step)
+    ends = np.minimum(starts + window, len(seq))
+
+    # Each window is the difference of two prefix sums
+    def count(mask: np.ndarray) -> np.ndarray:
+        sums = prefix_sums(seq, mask)
+        return (sums[ends] - sums[starts]).astype(np.int64)
+
+    gc = count(IS_GC)
+    if skew:
+        # G - C is 2G - (G + C), so only skew needs a second pass
+        values = np.divide(2 * count(IS_G) - gc,
+                           gc,
+                           out=np.zeros(len(gc)),
+                           where=gc > 0)
+    else:
+        values = gc * 100 / (ends - starts)
+
+    return Windows(starts, ends, values)
+
+
+# --------------------------------------------------
+def test_gc_windows() -> None:
+    """ Test gc_windows """
+
+    windows = gc_windows(b'', 2, 2)
+    assert windows.starts.tolist() == windows.values.tolist() == []
+
+    windows = gc_windows(b'GGCCAT', 4, 2)
+    assert windows.starts.tolist() == [0, 2]
+    assert windows.ends.tolist() == [4, 6]
+    assert windows.values.tolist() == [100., 50.]
+
+    windows = gc_windows(b'GGCCAT', 4, 2, skew=True)
+    assert windows.values.tolist() == [0., -1.]
+
+    windows = gc_windows(b'gggc', 2, 1, skew=True)
+    assert windows.values.tolist() == [1., 1., 0.]
+
+    # One partial window for the bases after the last full one
+    windows = gc_windows(b'GGCCAAT', 4, 2)
+    assert windows.starts.tolist() == [0, 2, 4]
+    assert windows.ends.tolist() == [4, 6, 7]
+    assert windows.values.tolist() == [100., 50., 0.]
+
+    # Shorter than a window, or windows with gaps between them
+    assert gc_windows(b'GC', 4, 2).ends.tolist() == [2]
+    windows = gc_windows(b'GGAAACCCCCT', 2, 5)
+    assert windows.starts.tolist() == [0, 5, 10]
+    assert windows.ends.tolist() == [2, 7, 11]
+
+
+# --------------------------------------------------
+def write_bedgraph(fh: TextIO, chrom: str, windows: Windows) -> None:
+    """ Write one line per window """
+
+    fh.writelines(
+        f'{chrom}\t{start}\t{end}\t{value:.6f}\n'
+        for start, end, value in zip(windows.starts.tolist(),
+                                     windows.ends.tolist(),
+                                     windows.values.tolist()))
+
+
+# --------------------------------------------------
+def test_write_bedgraph() -> None:
+    """ Test write_bedgraph """
+
+    out = io.StringIO()
+    write_bedgraph(out, 'chr1', gc_windows(b'GGCCA', 4, 4))
+    assert out.getvalue() == 'chr1\t0\t4\t100.000000\nchr1\t4\t5\t0.000000\n'
+
+
+# --------------------------------------------------
+if __name__ == '__main__':
+    main()
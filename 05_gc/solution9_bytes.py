@@ -0,0 +1,450 @@
+#!/usr/bin/env python3
+""" Compute GC content """
+
+import argparse
+import heapq
+import io
+import mmap
+import os
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from functools import partial
+from itertools import chain
+from multiprocessing import Pool
+from operator import attrgetter
+from typing import (BinaryIO, Callable, Iterable, Iterator, List, NamedTuple,
+                    Optional, Tuple)
+
+# Read files in blocks of this many bytes
+BUFSIZE = 1024 * 1024
+
+# Split files into shards of at most this size for the worker processes
+SHARD_SIZE = 64 * 1024 * 1024
+
+
+class Args(NamedTuple):
+    """ Command-line arguments """
+    files: List[str]
+    workers: int
+    all: bool
+    top: int
+    bottom: int
+
+
+class MySeq(NamedTuple):
+    """ Sequence """
+    gc: float
+    name: str
+
+
+class Shard(NamedTuple):
+    """ A byte range of an input file """
+    path: str
+    start: int
+    end: int
+
+
+class Ranking(NamedTuple):
+    """ The records kept from one file or shard """
+    top: Iterable[MySeq]
+    bottom: List[MySeq]
+
+
+# --------------------------------------------------
+def get_args() -> Args:
+    """ Get command-line arguments """
+
+    parser = argparse.ArgumentParser(
+        description='Compute GC content',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+
+    parser.add_argument('file',
+                        metavar='FILE',
+                        nargs='*',
+                        default=['-'],
+                        help='Input sequence file(s), "-" for STDIN')
+
+    parser.add_argument('-w',
+                        '--workers',
+                        metavar='int',
+                        type=int,
+                        default=1,
+                        help='Number of worker processes for a file')
+
+    parser.add_argument('-a',
+                        '--all',
+                        action='store_true',
+                        help='Print the GC content of every record')
+
+    parser.add_argument('-t',
+                        '--top',
+                        metavar='int',
+                        type=int,
+                        default=0,
+                        help='Print this many records with the highest GC')
+
+    parser.add_argument('-b',
+                        '--bottom',
+                        metavar='int',
+                        type=int,
+                        default=0,
+                        help='Print this many records with the lowest GC '
+                        '(after --top)')
+
+    args = parser.parse_args()
+
+    # Check the files but do not open them, they are read one at a time
+    for file in args.file:
+        if file != '-' and not os.path.exists(file):
+            parser.error(f"can't open '{file}': "
+                         f"No such file or directory: '{file}'")
+
+    if args.workers < 1:
+        parser.error(f'--workers "{args.workers}" must be greater than 0')
+
+    for name in ['top', 'bottom']:
+        if (num := getattr(args, name)) < 0:
+            parser.error(f'--{name} "{num}" must be 0 or greater')
+
+    if args.all and (args.top or args.bottom):
+        parser.error('--all cannot be used with --top or --bottom')
+
+    return Args(args.file, args.workers, args.all, args.top, args.bottom)
+
+
+# --------------------------------------------------
+def main() -> None:
+    """ Make a jazz noise here """
+
+    args = get_args()
+    keep = partial(summarize,
+                   keep_all=args.all,
+                   top=args.top,
+                   bottom=args.bottom)
+
+    try:
+        # STDIN and pipes cannot be split, so they are read by this process
+        if args.workers > 1 and all(map(os.path.isfile, args.files)):
+            jobs = shards(args.files, args.workers)
+            with Pool(min(args.workers, len(jobs))) as pool:
+                report(pool.imap(partial(gc_shard, keep=keep), jobs), args)
+        else:
+            report((keep(read_gc(file)) for file in args.files), args)
+    except OSError as err:
+        sys.exit(str(err))
+
+
+# --------------------------------------------------
+def read_gc(file: str) -> Iterator[MySeq]:
+    """ Open a file only once its records are wanted, "-" is STDIN """
+
+    if file == '-':
+        yield from find_gc(sys.stdin.buffer)
+    else:
+        with open(file, 'rb') as fh:
+            yield from find_gc(fh)
+
+
+# --------------------------------------------------
+def report(rankings: Iterable[Ranking], args: Args) -> None:
+    """ Merge the records kept from each file or shard, in order """
+
+    seqs: Iterable[MySeq]
+    if args.all:
+        seqs = chain.from_iterable(r.top for r in rankings)
+    elif args.top or args.bottom:
+        # Merge each ranking as it arrives, so no more than top + bottom
+        # records are held, and nlargest() keeps the earlier of any ties
+        by_gc = attrgetter('gc')
+        high: List[MySeq] = []
+        low: List[MySeq] = []
+        for ranking in rankings:
+            high = heapq.nlargest(args.top,
+                                  chain(high, ranking.top),
+                                  key=by_gc)
+            low = heapq.nsmallest(args.bottom,
+                                  chain(low, ranking.bottom),
+                                  key=by_gc)
+        seqs = high + low
+    else:
+        # Like the other solutions, print an empty ID for no records
+        winner = best(chain.from_iterable(r.top for r in rankings))
+        seqs = [winner or MySeq(0., '')]
+
+    for seq in seqs:
+        print(f'{seq.name} {seq.gc:0.6f}')
+
+
+# --------------------------------------------------
+def test_report() -> None:
+    """ Test report """
+
+    def run(rankings: List[Ranking], **opts: int) -> str:
+        args = Args([], 1, False, opts.get('top', 0), opts.get('bottom', 0))
+        out = io.StringIO()
+        with redirect_stdout(out):
+            report(iter(rankings), args)
+        return out.getvalue()
+
+    first = rank([MySeq(50., 'a'), MySeq(10., 'b')], 2, 2)
+    second = rank([MySeq(90., 'c'), MySeq(50., 'd'), MySeq(10., 'e')], 2, 2)
+    assert run([first, second], top=2, bottom=1) == \
+        'c 90.000000\na 50.000000\nb 10.000000\n'
+    assert run([second, first], top=2, bottom=1) == \
+        'c 90.000000\nd 50.000000\ne 10.000000\n'
+    assert run([first, second], top=0, bottom=0) == 'c 90.000000\n'
+
+    # An empty file keeps nothing, so it cannot beat a record with 0% GC
+    empty, no_gc = summarize([]), summarize([MySeq(0., 'f'), MySeq(0., 'g')])
+    assert run([empty, no_gc]) == 'f 0.000000\n'
+    assert run([empty]) == ' 0.000000\n'
+
+
+# --------------------------------------------------
+def summarize(seqs: Iterable[MySeq],
+              keep_all: bool = False,
+              top: int = 0,
+              bottom: int = 0) -> Ranking:
+    """ Keep every record, the highest and lowest, or only the best """
+
+    if keep_all:
+        return Ranking(seqs, [])
+
+    if top or bottom:
+        return rank(seqs, top, bottom)
+
+    high = best(seqs)
+    return Ranking([] if high is None else [high], [])
+
+
+# --------------------------------------------------
+def rank(seqs: Iterable[MySeq], top: int, bottom: int) -> Ranking:
+    """ The highest and lowest records, holding only that many at once """
+
+    # Min-heaps whose roots are the records to drop next,
+    # the position breaks ties so the first record wins
+    high: List[Tuple[float, int, MySeq]] = []
+    low: List[Tuple[float, int, MySeq]] = []
+    for i, seq in enumerate(seqs):
+        for heap, size, item in [(high, top, (seq.gc, -i, seq)),
+                                 (low, bottom, (-seq.gc, -i, seq))]:
+            if len(heap) < size:
+                heapq.heappush(heap, item)
+            elif size and item > heap[0]:
+                heapq.heapreplace(heap, item)
+
+    return Ranking([item[2] for item in sorted(high, reverse=True)],
+                   [item[2] for item in sorted(low, reverse=True)])
+
+
+# --------------------------------------------------
+def test_rank() -> None:
+    """ Test rank """
+
+    seqs = [
+        MySeq(50., 'a'),
+        MySeq(10., 'b'),
+        MySeq(90., 'c'),
+        MySeq(50., 'd'),
+        MySeq(10., 'e')
+    ]
+    assert rank([], 2, 2) == Ranking([], [])
+    assert rank(seqs, 0, 0) == Ranking([], [])
+    assert rank(seqs, 3, 0) == Ranking([seqs[2], seqs[0], seqs[3]], [])
+    assert rank(seqs, 0, 3) == Ranking([], [seqs[1], seqs[4], seqs[0]])
+    assert rank(seqs, 10, 1) == Ranking(
+        [seqs[2], seqs[0], seqs[3], seqs[1], seqs[4]], [seqs[1]])
+
+
+# --------------------------------------------------
+def best(seqs: Iterable[MySeq]) -> Optional[MySeq]:
+    """ The first record with the highest GC content, if any """
+
+    high: Optional[MySeq] = None
+    for seq in seqs:
+        if high is None or seq.gc > high.gc:
+            high = seq
+
+    return high
+
+
+# --------------------------------------------------
+def test_best() -> None:
+    """ Test best """
+
+    assert best([]) is None
+    assert best([MySeq(0., 'a'), MySeq(0., 'b')]) == MySeq(0., 'a')
+    assert best([MySeq(1., 'a'), MySeq(2., 'b'),
+                 MySeq(2., 'c')]) == MySeq(2., 'b')
+
+
+# --------------------------------------------------
+def find_gc(fh: BinaryIO,
+            size: int = BUFSIZE,
+            length: int = -1) -> Iterator[MySeq]:
+    """
+    Scan FASTA in blocks, reading at most "length" bytes,
+    and return the GC content and ID of each record
+    """
+
+    header: Optional[bytes] = None
+    in_header, line_start, gc, seq_len = False, True, 0, 0
+
+    while length != 0:
+        buf = fh.read(size if length < 0 else min(size, length))
+        if not buf:
+            break
+
+        length -= len(buf) if length > 0 else 0
+        pos = 0
+        while pos < len(buf):
+            # Header lines may span blocks
+            if in_header:
+                newline = buf.find(b'\n', pos)
+                end = len(buf) if newline < 0 else newline + 1
+                header = (header or b'') + buf[pos:end]
+                pos, in_header, line_start = end, newline < 0, True
+                continue
+
+            if line_start and buf[pos] == ord('>'):
+                if header is not None:
+                    yield make_seq(header, gc, seq_len)
+                header, in_header, gc, seq_len = b'', True, 0, 0
+                pos += 1
+                continue
+
+            # Count everything up to the next header or the end of the block
+            next_header = buf.find(b'\n>', pos)
+            end = len(buf) if next_header < 0 else next_header + 1
+            if header is not None:
+                # SeqIO removes line endings and spaces from the sequence,
+                # and deleting bytes is faster than counting common ones
+                seq = buf[pos:end].translate(None, b'\n\r ')
+                gc += len(seq) - len(seq.translate(None, b'GCgc'))
+                seq_len += len(seq)
+            line_start = buf[end - 1] == ord('\n')
+            pos = end
+
+    if header is not None:
+        yield make_seq(header, gc, seq_len)
+
+
+# --------------------------------------------------
+def make_seq(header: bytes, gc: int, length: int) -> MySeq:
+    """ Turn the counts for one record into a percentage """
+
+    # The ID is the first word of the header, like SeqIO
+    words = header.split(None, 1)
+    name = words[0].decode() if words else ''
+
+    return MySeq((gc * 100) / length if length else 0., name)
+
+
+# --------------------------------------------------
+def test_find_gc() -> None:
+    """ Test find_gc """
+
+    def run(fasta: bytes) -> list:
+        return [
+            list(find_gc(io.BytesIO(fasta), size))
+            for size in [1, 2, 3, 7, BUFSIZE]
+        ]
+
+    for result in run(b''):
+        assert result == []
+
+    for result in run(b'>123\n'):
+        assert result == [MySeq(0., '123')]
+
+    fasta = b'>ABC desc>\nCG\nTA\n>\n\n>XYZ\r\nga tc\r\nGG>\n'
+    for result in run(fasta):
+        assert result == [
+            MySeq(50., 'ABC'),
+            MySeq(0., ''),
+            MySeq(400 / 7, 'XYZ'),
+        ]
+
+    assert list(find_gc(io.BytesIO(fasta), 4, 17)) == [MySeq(50., 'ABC')]
+
+
+# --------------------------------------------------
+def shards(paths: List[str],
+           workers: int,
+           min_size: int = BUFSIZE) -> List[Shard]:
+    """ Split the files into about one shard per worker """
+
+    # Shards smaller than a read block are mostly overhead, and larger
+    # ones than SHARD_SIZE leave the last workers waiting on the others
+    total_size = sum(map(os.path.getsize, paths))
+    size = min(SHARD_SIZE, max(min_size, total_size // workers + 1))
+
+    jobs: List[Shard] = []
+    for path in paths:
+        start, end = 0, os.path.getsize(path)
+        if end > size:
+            with open(path, 'rb') as fh, \
+                    mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mem:
+                # Cut just before a header, so each record's GC is counted
+                # by one worker
+                while (cut := mem.find(b'\n>', start + size - 1)) >= 0:
+                    jobs.append(Shard(path, start, cut + 1))
+                    start = cut + 1
+        jobs.append(Shard(path, start, end))
+
+    return jobs
+
+
+# --------------------------------------------------
+def gc_shard(
+        shard: Shard,
+        keep: Callable[[Iterable[MySeq]], Ranking] = summarize) -> Ranking:
+    """ Keep the records from one shard of a file """
+
+    with open(shard.path, 'rb') as fh:
+        fh.seek(shard.start)
+        ranking = keep(find_gc(fh, length=shard.end - shard.start))
+        return Ranking(list(ranking.top), ranking.bottom)
+
+
+# --------------------------------------------------
+def test_shards() -> None:
+    """ Test shards """
+
+    with tempfile.NamedTemporaryFile() as tmp:
+        tmp.write(b'>1\nAAAA\n>2\nCC\n>3\nGGGGGG\n')
+        tmp.flush()
+        name = tmp.name
+
+        assert shards([name], 1) == [Shard(name, 0, 24)]
+        assert shards([name], 6, 1) == [
+            Shard(name, 0, 8),
+            Shard(name, 8, 14),
+            Shard(name, 14, 24)
+        ]
+        assert shards([name], 3, 1) == shards([name], 6, 10) == [
+            Shard(name, 0, 14),
+            Shard(name, 14, 24)
+        ]
+        assert shards([name, name], 2, 1) == [
+            Shard(name, 0, 24), Shard(name, 0, 24)
+        ]
+        assert shards([name, name], 4, 1) == [
+            Shard(name, 0, 14),
+            Shard(name, 14, 24),
+            Shard(name, 0, 14),
+            Shard(name, 14, 24)
+        ]
+        keep_all = partial(summarize, keep_all=True)
+        assert [gc_shard(shard, keep_all)
+                for shard in shards([name], 3, 1)] == [
+                    Ranking([MySeq(0., '1'), MySeq(100., '2')], []),
+                    Ranking([MySeq(100., '3')], [])
+                ]
+        assert gc_shard(Shard(name, 0, 14)) == Ranking([MySeq(100., '2')],
+                                                       [])
+
+
+# --------------------------------------------------
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+""" Tests for the options only solution9_bytes.py has """
+
+import platform
+from subprocess import getstatusoutput
+
+PRG = './solution9_bytes.py'
+RUN = f'python {PRG}' if platform.system() == 'Windows' else PRG
+SAMPLE2 = './tests/inputs/2.fa'
+AT = './tests/inputs/at.fa'
+
+
+# --------------------------------------------------
+def test_all() -> None:
+    """ Prints every record in order """
+
+    rv, out = getstatusoutput(f'{RUN} --all {SAMPLE2}')
+    assert rv == 0
+    assert out.splitlines() == [
+        'Rosalind_1424 50.000000',
+        'Rosalind_5723 52.806415',
+        'Rosalind_2844 52.789700',
+        'Rosalind_4250 50.222717',
+        'Rosalind_4718 47.909200',
+        'Rosalind_5964 48.109966',
+        'Rosalind_2501 51.101322',
+        'Rosalind_2643 52.417582',
+        'Rosalind_4802 48.780488',
+    ]
+
+
+# --------------------------------------------------
+def test_top_bottom() -> None:
+    """ Prints the highest and then the lowest records """
+
+    rv, out = getstatusoutput(f'{RUN} -t 2 -b 1 {SAMPLE2}')
+    assert rv == 0
+    assert out.splitlines() == [
+        'Rosalind_5723 52.806415',
+        'Rosalind_2844 52.789700',
+        'Rosalind_4718 47.909200',
+    ]
+
+
+# --------------------------------------------------
+def test_no_gc() -> None:
+    """ Prints the first record when none has any GC """
+
+    assert getstatusoutput(f'{RUN} {AT}') == (0, 'at1 0.000000')
+    assert getstatusoutput(f'{RUN} -w 2 {AT} {AT}') == (0, 'at1 0.000000')
+
+
+# --------------------------------------------------
+def test_workers() -> None:
+    """ Worker processes give the same answer """
+
+    for opts in ['', '-a', '-t 3 -b 2']:
+        rv, out = getstatusoutput(f'{RUN} {opts} {SAMPLE2}')
+        assert rv == 0
+        assert getstatusoutput(f'{RUN} -w 2 {opts} {SAMPLE2}') == (0, out)
+
+
+# --------------------------------------------------
+def test_bad_options() -> None:
+    """ Dies on bad options """
+
+    for opts, error in [
+        ('-w 0', '--workers "0" must be greater than 0'),
+        ('-t -1', '--top "-1" must be 0 or greater'),
+        ('-b -1', '--bottom "-1" must be 0 or greater'),
+        ('-a -t 1', '--all cannot be used with --top or --bottom'),
+    ]:
+        rv, out = getstatusoutput(f'{RUN} {opts} {SAMPLE2}')
+        assert rv != 0
+        assert out.lower().startswith('usage:')
+        assert error in out
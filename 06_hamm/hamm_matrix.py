@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+""" All-vs-all Hamming distances for equal-length reads """
+
+import argparse
+import io
+import sys
+from functools import partial
+from multiprocessing import Pool
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, TextIO
+from Bio import SeqIO
+import numpy as np
+
+# Set in each worker process by init_worker()
+WORKER: Dict[str, Any] = {}
+
+# Compare at most this many bases at once, one byte each
+BUDGET = 16 * 1024 * 1024
+
+
+class Args(NamedTuple):
+    """ Command-line arguments """
+    file: TextIO
+    outfile: TextIO
+    max_dist: Optional[int]
+    block: int
+    workers: int
+
+
+class Reads(NamedTuple):
+    """ Read IDs and the sequences as rows of ASCII codes """
+    ids: List[str]
+    seqs: np.ndarray
+    length: int
+
+
+# --------------------------------------------------
+def get_args() -> Args:
+    """ Get command-line arguments """
+
+    parser = argparse.ArgumentParser(
+        description='All-vs-all Hamming distances for equal-length reads',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+
+    parser.add_argument('file',
+                        metavar='FILE',
+                        type=argparse.FileType('rt'),
+                        nargs='?',
+                        default=sys.stdin,
+                        help='Input FASTA file')
+
+    parser.add_argument('-o',
+                        '--outfile',
+                        metavar='FILE',
+                        type=argparse.FileType('wt'),
+                        default=sys.stdout,
+                        help='Output file')
+
+    parser.add_argument('-d',
+                        '--max_dist',
+                        metavar='int',
+                        type=int,
+                        help='Print only the pairs at most this far apart')
+
+    parser.add_argument('-b',
+                        '--block',
+                        metavar='int',
+                        type=int,
+                        default=1024,
+                        help='Number of matrix rows computed at once')
+
+    parser.add_argument('-w',
+                        '--workers',
+                        metavar='int',
+                        type=int,
+                        default=1,
+                        help='Number of worker processes')
+
+    args = parser.parse_args()
+
+    if args.max_dist is not None and args.max_dist < 0:
+        parser.error(f'--max_dist "{args.max_dist}" must be 0 or greater')
+
+    for name in ['block', 'workers']:
+        if (num := getattr(args, name)) < 1:
+            parser.error(f'--{name} "{num}" must be greater than 0')
+
+    return Args(args.file, args.outfile, args.max_dist, args.block,
+                args.workers)
+
+
+# --------------------------------------------------
+def main() -> None:
+    """ Make a jazz noise here """
+
+    args = get_args()
+
+    try:
+        reads = load(args.file)
+    except ValueError as err:
+        sys.exit(str(err))
+
+    starts = range(0, len(reads.ids), args.block)
+    fmt = partial(format_block, block=args.block, max_dist=args.max_dist)
+
+    # imap() returns the blocks in order, so the output is the same
+    if args.workers > 1 and len(starts) > 1:
+        with Pool(min(args.workers, len(starts)),
+                  initializer=init_worker,
+                  initargs=(reads, )) as pool:
+            for text in pool.imap(partial(run_block, fmt=fmt), starts):
+                args.outfile.write(text)
+    else:
+        for start in starts:
+            args.outfile.write(fmt(reads, start))
+
+
+# --------------------------------------------------
+def load(fh: TextIO) -> Reads:
+    """ Read FASTA into a 2-D array, one row per read """
+
+    ids, seqs = [], []
+    for rec in SeqIO.parse(fh, 'fasta'):
+        ids.append(rec.id)
+        seqs.append(bytes(rec.seq))
+
+    lengths = set(map(len, seqs))
+    if len(lengths) > 1:
+        raise ValueError(
+            f'Reads must be the same length, found {sorted(lengths)}')
+
+    length = lengths.pop() if lengths else 0
+    arr = np.frombuffer(b''.join(seqs), dtype=np.uint8).reshape(
+        len(seqs), length)
+
+    return Reads(ids, arr, length)
+
+
+# --------------------------------------------------
+def test_load() -> None:
+    """ Test load """
+
+    reads = load(io.StringIO(''))
+    assert reads.ids == []
+    assert reads.seqs.shape[0] == 0
+
+    reads = load(io.StringIO('>a\nACG\n>b\nAAN\n'))
+    assert reads.ids == ['a', 'b']
+    assert reads.length == 3
+    assert reads.seqs.tobytes() == b'ACGAAN'
+
+    try:
+        load(io.StringIO('>a\nACG\n>b\nAA\n'))
+        assert False
+    except ValueError as err:
+        assert str(err) == 'Reads must be the same length, found [2, 3]'
+
+
+# --------------------------------------------------
+def distances(reads: Reads,
+              start: int,
+              end: int,
+              budget: int = BUDGET) -> np.ndarray:
+    """ Distances from reads start:end to every read from start on """
+
+    rows = reads.seqs[start:end]
+    dtype = np.uint16 if reads.length < 2**16 else np.uint32
+    dist = np.empty((len(rows), len(reads.ids) - start), dtype=dtype)
+
+    # Compare against as many reads at a time as fit in the budget
+    step = max(1, budget // max(1, len(rows) * reads.length))
+    for col in range(0, dist.shape[1], step):
+        cols = reads.seqs[start + col:start + col + step]
+        np.sum(rows[:, None, :] != cols[None, :, :],
+               axis=-1,
+               dtype=dtype,
+               out=dist[:, col:col + len(cols)])
+
+    return dist
+
+
+# --------------------------------------------------
+def test_distances() -> None:
+    """ Test distances """
+
+    reads = load(io.StringIO('>a\nGAGC\n>b\nCATC\n>c\nGAGC\n>d\ngagc\n'))
+    expected = [[0, 2, 0, 4], [2, 0, 2, 4], [0, 2, 0, 4], [4, 4, 4, 0]]
+    assert distances(reads, 0, 4).tolist() == expected
+    assert distances(reads, 2, 3).tolist() == [[0, 4]]
+
+    # A budget smaller than one comparison still goes one read at a time
+    for budget in [1, 8, 20]:
+        assert distances(reads, 0, 4, budget).tolist() == expected
+
+
+# --------------------------------------------------
+def format_block(reads: Reads,
+                 start: int,
+                 block: int,
+                 max_dist: Optional[int] = None) -> str:
+    """ Condensed matrix rows, or pairs no more than max_dist apart """
+
+    end = min(start + block, len(reads.ids))
+    dist = distances(reads, start, end)
+
+    # Keep only the pairs of row i with the reads after it,
+    # looking up the few possible distances is faster than str()
+    if max_dist is None:
+        labels = [str(d) for d in range(reads.length + 1)]
+        return ''.join(
+            '\t'.join([labels[d] for d in row[i + 1:].tolist()]) + '\n'
+            for i, row in enumerate(dist) if start + i + 1 < len(reads.ids))
+
+    upper = np.arange(dist.shape[1]) > np.arange(dist.shape[0])[:, None]
+    rows, cols = np.nonzero(upper & (dist <= max_dist))
+    return ''.join(f'{reads.ids[start + i]}\t{reads.ids[start + j]}\t{d}\n'
+                   for i, j, d in zip(rows.tolist(), cols.tolist(),
+                                      dist[rows, cols].tolist()))
+
+
+# --------------------------------------------------
+def test_format_block() -> None:
+    """ Test format_block """
+
+    reads = load(io.StringIO('>a\nGAGC\n>b\nCATC\n>c\nGAGG\n'))
+    assert format_block(reads, 0, 3) == '2\t1\n3\n'
+    assert format_block(reads, 0, 2) + format_block(reads, 2, 2) == \
+        format_block(reads, 0, 3)
+    assert format_block(reads, 0, 2, 1) == 'a\tc\t1\n'
+    assert format_block(reads, 1, 2, 3) == 'b\tc\t3\n'
+    assert format_block(load(io.StringIO('')), 0, 2) == ''
+
+
+# --------------------------------------------------
+def init_worker(reads: Reads) -> None:
+    """ Keep one copy of the reads in each worker """
+
+    WORKER['reads'] = reads
+
+
+# --------------------------------------------------
+def run_block(start: int, fmt: Callable[[Reads, int], str]) -> str:
+    """ Format one block in a worker """
+
+    return fmt(WORKER['reads'], start)
+
+
+# --------------------------------------------------
+if __name__ == '__main__':
+    main()
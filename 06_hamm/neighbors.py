@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+""" Find read pairs within a Hamming distance using a pigeonhole index """
+
+import argparse
+import sys
+import time
+from collections import defaultdict
+from itertools import combinations
+from typing import DefaultDict, List, NamedTuple, TextIO, Tuple
+from Bio import SeqIO
+from solution8_operator_starmap import hamming
+
+# Two read numbers and their distance
+Pair = Tuple[int, int, int]
+
+
+class Args(NamedTuple):
+    """ Command-line arguments """
+    file: TextIO
+    outfile: TextIO
+    max_dist: int
+    benchmark: bool
+
+
+# --------------------------------------------------
+def get_args() -> Args:
+    """ Get command-line arguments """
+
+    parser = argparse.ArgumentParser(
+        description='Find read pairs within a Hamming distance',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+
+    parser.add_argument('file',
+                        metavar='FILE',
+                        type=argparse.FileType('rt'),
+                        nargs='?',
+                        default=sys.stdin,
+                        help='Input FASTA file')
+
+    parser.add_argument('-o',
+                        '--outfile',
+                        metavar='FILE',
+                        type=argparse.FileType('wt'),
+                        default=sys.stdout,
+                        help='Output file')
+
+    parser.add_argument('-d',
+                        '--max_dist',
+                        metavar='int',
+                        type=int,
+                        default=1,
+                        help='Print the pairs at most this far apart')
+
+    parser.add_argument('-b',
+                        '--benchmark',
+                        action='store_true',
+                        help='Time the index against all pairs on STDERR')
+
+    args = parser.parse_args()
+
+    if args.max_dist < 0:
+        parser.error(f'--max_dist "{args.max_dist}" must be 0 or greater')
+
+    return Args(args.file, args.outfile, args.max_dist, args.benchmark)
+
+
+# --------------------------------------------------
+def main() -> None:
+    """ Make a jazz noise here """
+
+    args = get_args()
+
+    ids, seqs = [], []
+    for rec in SeqIO.parse(args.file, 'fasta'):
+        ids.append(rec.id)
+        seqs.append(str(rec.seq))
+
+    start = time.perf_counter()
+    try:
+        pairs = neighbors(seqs, args.max_dist)
+    except ValueError as err:
+        sys.exit(str(err))
+
+    if args.benchmark:
+        secs = time.perf_counter() - start
+        start = time.perf_counter()
+        assert all_pairs(seqs, args.max_dist) == pairs
+        brute = time.perf_counter() - start
+        print(f'{len(seqs):,} reads, {len(pairs):,} pairs\n'
+              f'{"neighbors":10} {secs:10.4f}s\n'
+              f'{"all_pairs":10} {brute:10.4f}s',
+              file=sys.stderr)
+
+    for i, j, dist in pairs:
+        print(ids[i], ids[j], dist, sep='\t', file=args.outfile)
+
+
+# --------------------------------------------------
+def segments(length: int, max_dist: int) -> List[Tuple[int, int]]:
+    """ Split a read into max_dist + 1 segments of nearly equal length """
+
+    num = max_dist + 1
+    bounds = [length * i // num for i in range(num + 1)]
+    return list(zip(bounds, bounds[1:]))
+
+
+# --------------------------------------------------
+def test_segments() -> None:
+    """ Test segments """
+
+    assert segments(10, 0) == [(0, 10)]
+    assert segments(10, 1) == [(0, 5), (5, 10)]
+    assert segments(10, 2) == [(0, 3), (3, 6), (6, 10)]
+    assert segments(2, 3) == [(0, 0), (0, 1), (1, 1), (1, 2)]
+
+
+# --------------------------------------------------
+def neighbors(seqs: List[str], max_dist: int) -> List[Pair]:
+    """ All pairs of equal-length reads at most max_dist apart """
+
+    if len(set(map(len, seqs))) > 1:
+        raise ValueError('Reads must be the same length')
+
+    # With max_dist + 1 segments, two reads that close must share one
+    bounds = segments(len(seqs[0]), max_dist) if seqs else []
+    index: DefaultDict[Tuple[int, str], List[int]] = defaultdict(list)
+    pairs = []
+
+    for j, seq in enumerate(seqs):
+        keys = [(num, seq[start:end])
+                for num, (start, end) in enumerate(bounds)]
+        candidates = {i for key in keys for i in index.get(key, [])}
+        for i in candidates:
+            if (dist := hamming(seqs[i], seq)) <= max_dist:
+                pairs.append((i, j, dist))
+
+        for key in keys:
+            index[key].append(j)
+
+    return sorted(pairs)
+
+
+# --------------------------------------------------
+def test_neighbors() -> None:
+    """ Test neighbors """
+
+    seqs = ['AAAA', 'AAAT', 'TTTT', 'AATT', 'AAAA']
+    assert neighbors([], 1) == []
+    assert neighbors(seqs, 0) == [(0, 4, 0)]
+    assert neighbors(seqs, 1) == [(0, 1, 1), (0, 4, 0), (1, 3, 1), (1, 4, 1)]
+    for max_dist in range(5):
+        assert neighbors(seqs, max_dist) == all_pairs(seqs, max_dist)
+
+    try:
+        neighbors(['AAAA', 'AA'], 1)
+        assert False
+    except ValueError:
+        pass
+
+
+# --------------------------------------------------
+def all_pairs(seqs: List[str], max_dist: int) -> List[Pair]:
+    """ Compare every pair of reads """
+
+    return [(i, j, dist)
+            for (i, seq1), (j, seq2) in combinations(enumerate(seqs), 2)
+            if (dist := hamming(seq1, seq2)) <= max_dist]
+
+
+# --------------------------------------------------
+def test_all_pairs() -> None:
+    """ Test all_pairs """
+
+    assert all_pairs([], 1) == []
+    assert all_pairs(['AA', 'AT', 'TT'], 1) == [(0, 1, 1), (1, 2, 1)]
+
+
+# --------------------------------------------------
+if __name__ == '__main__':
+    main()
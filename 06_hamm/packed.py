@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+""" Hamming distance on DNA packed two bits per base """
+
+import argparse
+import random
+import timeit
+from typing import NamedTuple, Tuple
+import numpy as np
+from solution8_operator_starmap import hamming
+
+# ACGT become the base-4 digits 0123, anything else is an error. Lowercase
+# is an error, too, as hamming() counts "a" and "A" as a mismatch
+TO_DIGITS = bytes.maketrans(b'ACGT', b'0123')
+NOT_ACGT = bytes(set(range(256)) - set(b'ACGT'))
+
+# Bases packed into each array word
+WORD_BASES = 32
+
+# Keep the low bit of every 2-bit base
+LOW_BITS = np.uint64(0x5555555555555555)
+
+# Number of set bits in each byte
+POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+# Packed bases and the number of bases
+PackedInt = Tuple[int, int]
+PackedArray = Tuple[np.ndarray, int]
+
+
+class Args(NamedTuple):
+    """ Command-line arguments """
+    seq_len: int
+    seed: int
+
+
+# --------------------------------------------------
+def get_args() -> Args:
+    """ Get command-line arguments """
+
+    parser = argparse.ArgumentParser(
+        description='Benchmark packed Hamming distance',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+
+    parser.add_argument('-l',
+                        '--len',
+                        metavar='int',
+                        type=int,
+                        default=1000000,
+                        help='Sequence length')
+
+    parser.add_argument('-s',
+                        '--seed',
+                        metavar='int',
+                        type=int,
+                        default=1,
+                        help='Random seed')
+
+    args = parser.parse_args()
+
+    if args.len < 1:
+        parser.error(f'--len "{args.len}" must be greater than 0')
+
+    return Args(args.len, args.seed)
+
+
+# --------------------------------------------------
+def main() -> None:
+    """ Make a jazz noise here """
+
+    args = get_args()
+    random.seed(args.seed)
+    seq1 = ''.join(random.choices('ACGT', k=args.seq_len))
+    seq2 = ''.join(random.choices('ACGT', k=args.seq_len))
+    int1, int2 = pack_int(seq1), pack_int(seq2)
+    arr1, arr2 = pack_array(seq1), pack_array(seq2)
+
+    expected = hamming(seq1, seq2)
+    assert hamming_int(int1, int2) == hamming_array(arr1, arr2) == expected
+
+    print(f'{args.seq_len:,} bases, distance {expected:,}')
+    for name, func in [
+        ('hamming', lambda: hamming(seq1, seq2)),
+        ('hamming_int', lambda: hamming_int(int1, int2)),
+        ('hamming_array', lambda: hamming_array(arr1, arr2)),
+        ('pack_int', lambda: pack_int(seq1)),
+        ('pack_array', lambda: pack_array(seq1)),
+    ]:
+        secs = min(timeit.repeat(func, number=1, repeat=3))
+        print(f'{name:15} {secs:10.6f}s {args.seq_len / secs:15,.0f} bases/s')
+
+
+# --------------------------------------------------
+def to_digits(seq: str) -> bytes:
+    """ Turn ACGT into base-4 digits, rejecting anything else """
+
+    raw = seq.encode()
+    if len(raw.translate(None, NOT_ACGT)) != len(raw):
+        raise ValueError('Sequence must contain only A, C, G, or T')
+
+    return raw.translate(TO_DIGITS)
+
+
+# --------------------------------------------------
+def pack_int(seq: str) -> PackedInt:
+    """ Pack a sequence into one int, the first base in the highest bits """
+
+    return (int(to_digits(seq), 4) if seq else 0), len(seq)
+
+
+# --------------------------------------------------
+def test_pack_int() -> None:
+    """ Test pack_int """
+
+    assert pack_int('') == (0, 0)
+    assert pack_int('A') == (0, 1)
+    assert pack_int('ACGT') == (0b00011011, 4)
+    assert pack_int('TGCA') == (0b11100100, 4)
+
+    for bad in ['ACNT', 'acgt']:
+        try:
+            pack_int(bad)
+            assert False
+        except ValueError:
+            pass
+
+
+# --------------------------------------------------
+def hamming_int(seq1: PackedInt, seq2: PackedInt) -> int:
+    """ Hamming distance of packed ints, extra bases are mismatches """
+
+    (x, len1), (y, len2) = seq1, seq2
+
+    # Line up the first bases by dropping the end of the longer one
+    if len1 > len2:
+        x >>= 2 * (len1 - len2)
+    else:
+        y >>= 2 * (len2 - len1)
+
+    # A base differs if either of its bits differ, (4**n - 1) // 3 is 0101...
+    diff = x ^ y
+    diff = (diff | diff >> 1) & ((1 << 2 * min(len1, len2)) - 1) // 3
+    return popcount(diff) + abs(len1 - len2)
+
+
+# --------------------------------------------------
+def popcount(x: int) -> int:
+    """ Number of set bits """
+
+    return x.bit_count() if hasattr(x, 'bit_count') else bin(x).count('1')
+
+
+# --------------------------------------------------
+def test_hamming_int() -> None:
+    """ Test hamming_int """
+
+    for seq1, seq2 in [('', ''), ('AC', 'ACGT'), ('ACGT', 'A'), ('A', 'T'),
+                       ('GAGCCTACTAACGGGAT', 'CATCGTAATGACGGCCT'),
+                       ('ACGT' * 100, 'TGCA' * 99)]:
+        assert hamming_int(pack_int(seq1),
+                           pack_int(seq2)) == hamming(seq1, seq2)
+
+
+# --------------------------------------------------
+def pack_array(seq: str) -> PackedArray:
+    """ Pack a sequence into uint64 words of 32 bases """
+
+    codes = np.frombuffer(to_digits(seq), dtype=np.uint8)
+
+    # Four bases to a byte, the first in the highest bits, written straight
+    # into a buffer of whole words so no wider temporaries are made. Both
+    # sequences pad with A the same way.
+    num_words = -(-len(codes) // WORD_BASES)
+    packed = np.zeros(num_words * 8, dtype=np.uint8)
+    for i in range(4):
+        part = codes[i::4] - np.uint8(ord('0'))
+        part <<= np.uint8(6 - 2 * i)
+        packed[:len(part)] |= part
+
+    # Read the bytes big-endian, so the first base is in the highest bits
+    return packed.view('>u8').astype(np.uint64), len(seq)
+
+
+# --------------------------------------------------
+def test_pack_array() -> None:
+    """ Test pack_array """
+
+    words, length = pack_array('')
+    assert not words.tolist() and length == 0
+
+    words, length = pack_array('ACGT')
+    assert words.tolist() == [0b00011011 << 56] and length == 4
+
+    words, length = pack_array('T' * 33)
+    assert words.tolist() == [2**64 - 1, 3 << 62] and length == 33
+
+    # Each word is the scalar packing of its 32 bases, the last padded with A
+    random.seed(1)
+    seq = ''.join(random.choices('ACGT', k=101))
+    words, length = pack_array(seq)
+    assert length == 101 and words.tolist() == [
+        pack_int(seq[i:i + WORD_BASES].ljust(WORD_BASES, 'A'))[0]
+        for i in range(0, len(seq), WORD_BASES)
+    ]
+
+
+# --------------------------------------------------
+def hamming_array(seq1: PackedArray, seq2: PackedArray) -> int:
+    """ Hamming distance of packed arrays, extra bases are mismatches """
+
+    (x, len1), (y, len2) = seq1, seq2
+    length = min(len1, len2)
+    num_words = -(-length // WORD_BASES)
+    diff = x[:num_words] ^ y[:num_words]
+    bases = (diff | diff >> np.uint64(1)) & LOW_BITS
+
+    # Clear the bases after the end of the shorter sequence
+    if extra := num_words * WORD_BASES - length:
+        bases[-1] &= ~np.uint64(0) << np.uint64(2 * extra)
+
+    mismatches = int(POPCOUNT[bases.view(np.uint8)].sum(dtype=np.int64))
+    return mismatches + abs(len1 - len2)
+
+
+# --------------------------------------------------
+def test_hamming_array() -> None:
+    """ Test hamming_array """
+
+    for seq1, seq2 in [('', ''), ('AC', 'ACGT'), ('ACGT', 'A'), ('A', 'T'),
+                       ('GAGCCTACTAACGGGAT', 'CATCGTAATGACGGCCT'),
+                       ('ACGT' * 100, 'TGCA' * 99), ('T' * 40, 'T' * 33)]:
+        assert hamming_array(pack_array(seq1),
+                             pack_array(seq2)) == hamming(seq1, seq2)
+
+
+# --------------------------------------------------
+if __name__ == '__main__':
+    main()
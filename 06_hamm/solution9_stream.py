@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+""" Hamming distance """
+
+import argparse
+import io
+import os
+from itertools import zip_longest
+from typing import (TYPE_CHECKING, BinaryIO, Iterable, Iterator, NamedTuple,
+                    Optional, TextIO, Tuple)
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Read files in blocks of this many bytes
+BUFSIZE = 1024 * 1024
+
+# Bytes between the bases that are not compared
+WHITESPACE = b' \t\r\n'
+
+
+class Args(NamedTuple):
+    """ Command-line arguments """
+    seq1: str
+    seq2: str
+    positions: Optional[TextIO]
+
+
+# --------------------------------------------------
+def get_args() -> Args:
+    """ Get command-line arguments """
+
+    parser = argparse.ArgumentParser(
+        description='Hamming distance',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+
+    parser.add_argument('seq1',
+                        metavar='str',
+                        help='Sequence 1 or file (raw or FASTA)')
+
+    parser.add_argument('seq2',
+                        metavar='str',
+                        help='Sequence 2 or file (raw or FASTA)')
+
+    parser.add_argument('-p',
+                        '--positions',
+                        metavar='FILE',
+                        type=argparse.FileType('wt'),
+                        help='Write the 1-based mismatch positions here')
+
+    args = parser.parse_args()
+
+    return Args(args.seq1, args.seq2, args.positions)
+
+
+# --------------------------------------------------
+def main() -> None:
+    """ Make a jazz noise here """
+
+    args = get_args()
+
+    # Compare files only when both are files, just as with strings
+    if os.path.isfile(args.seq1) and os.path.isfile(args.seq2):
+        with open(args.seq1, 'rb') as fh1, open(args.seq2, 'rb') as fh2:
+            print(hamming(read_bases(fh1), read_bases(fh2), args.positions))
+    else:
+        print(hamming_short(args.seq1, args.seq2, args.positions))
+
+
+# --------------------------------------------------
+def read_bases(fh: BinaryIO, size: int = BUFSIZE) -> Iterator[bytes]:
+    """ Read blocks of bases, skipping FASTA headers and whitespace """
+
+    in_header, line_start = False, True
+
+    while buf := fh.read(size):
+        pos, parts = 0, []
+        while pos < len(buf):
+            # Header lines may span blocks
+            if in_header:
+                newline = buf.find(b'\n', pos)
+                pos = len(buf) if newline < 0 else newline + 1
+                in_header, line_start = newline < 0, True
+                continue
+
+            if line_start and buf[pos] == ord('>'):
+                in_header = True
+                continue
+
+            next_header = buf.find(b'\n>', pos)
+            end = len(buf) if next_header < 0 else next_header + 1
+            parts.append(buf[pos:end])
+            line_start = buf[end - 1] == ord('\n')
+            pos = end
+
+        if bases := b''.join(parts).translate(None, WHITESPACE):
+            yield bases
+
+
+# --------------------------------------------------
+def test_read_bases() -> None:
+    """ Test read_bases """
+
+    def run(data: bytes) -> list:
+        return [
+            b''.join(read_bases(io.BytesIO(data), size))
+            for size in [1, 2, 3, 7, BUFSIZE]
+        ]
+
+    assert run(b'') == [b''] * 5
+    assert run(b'GAGC\nCT\n') == [b'GAGCCT'] * 5
+    assert run(b'>a A>\nGA\r\nGC\n>b\nCT') == [b'GAGCCT'] * 5
+    assert not list(read_bases(io.BytesIO(b'>a\n\n'), 1))
+
+
+# --------------------------------------------------
+def diff_chunks(
+        chunks1: Iterable[bytes],
+        chunks2: Iterable[bytes]) -> Iterator[Tuple[int, 'np.ndarray']]:
+    """ Offsets and mismatch masks for aligned stretches of two streams """
+
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    it1, it2 = iter(chunks1), iter(chunks2)
+    buf1, buf2, offset = memoryview(b''), memoryview(b''), 0
+
+    while True:
+        buf1 = buf1 or memoryview(next(it1, b''))
+        buf2 = buf2 or memoryview(next(it2, b''))
+        if not buf1 and not buf2:
+            return
+
+        # Compare the overlap, bases past the end of the other are mismatches
+        if buf1 and buf2:
+            num = min(len(buf1), len(buf2))
+            mask = np.frombuffer(buf1, dtype=np.uint8, count=num) != \
+                np.frombuffer(buf2, dtype=np.uint8, count=num)
+        else:
+            num = max(len(buf1), len(buf2))
+            mask = np.ones(num, dtype=bool)
+
+        yield offset, mask
+        offset += num
+        buf1, buf2 = buf1[num:], buf2[num:]
+
+
+# --------------------------------------------------
+def hamming(chunks1: Iterable[bytes],
+            chunks2: Iterable[bytes],
+            positions: Optional[TextIO] = None) -> int:
+    """ Calculate Hamming distance, maybe writing where they differ """
+
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    dist = 0
+    for offset, mask in diff_chunks(chunks1, chunks2):
+        dist += int(np.count_nonzero(mask))
+        if positions:
+            np.savetxt(positions, np.flatnonzero(mask) + offset + 1, fmt='%d')
+
+    return dist
+
+
+# --------------------------------------------------
+def test_hamming() -> None:
+    """ Test hamming """
+
+    assert hamming([], []) == 0
+    assert hamming([b'AC'], [b'ACGT']) == 2
+    assert hamming([b'GAGCCTACTAACGGGAT'], [b'CATCGTAATGACGGCCT']) == 7
+    assert hamming([b'GAG', b'CCTACTAACGG', b'GAT'],
+                   [b'CATCGTAA', b'TGACGGCCT']) == 7
+    assert hamming([b'A', b'C'], []) == 2
+
+    out = io.StringIO()
+    assert hamming([b'ACG', b'TAC'], [b'A', b'GGTTTTT'], out) == 5
+    assert out.getvalue() == '2\n5\n6\n7\n8\n'
+
+
+# --------------------------------------------------
+def hamming_short(seq1: str,
+                  seq2: str,
+                  positions: Optional[TextIO] = None) -> int:
+    """ Hamming distance of command-line strings, no need for numpy """
+
+    diffs = [
+        pos for pos, (base1, base2) in enumerate(zip_longest(seq1, seq2), 1)
+        if base1 != base2
+    ]
+    if positions:
+        positions.write(''.join(f'{pos}\n' for pos in diffs))
+
+    return len(diffs)
+
+
+# --------------------------------------------------
+def test_hamming_short() -> None:
+    """ Test hamming_short """
+
+    assert hamming_short('', '') == 0
+    assert hamming_short('AC', 'ACGT') == 2
+    assert hamming_short('GAGCCTACTAACGGGAT', 'CATCGTAATGACGGCCT') == 7
+
+    out = io.StringIO()
+    assert hamming_short('ACGTAC', 'AGGTTTTT', out) == 5
+    assert out.getvalue() == '2\n5\n6\n7\n8\n'
+
+
+# --------------------------------------------------
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,37 @@
+""" Tests for the options only solution9_stream.py has """
+
+import os
+import platform
+import tempfile
+from subprocess import getstatusoutput
+
+PRG = './solution9_stream.py'
+RUN = f'python {PRG}' if platform.system() == 'Windows' else PRG
+SEQ1 = './tests/inputs/seq1.fa'
+SEQ2 = './tests/inputs/seq2.fa'
+
+
+# --------------------------------------------------
+def test_files() -> None:
+    """ Compares two FASTA files, skipping headers and line breaks """
+
+    assert getstatusoutput(f'{RUN} {SEQ1} {SEQ2}') == (0, '7')
+
+
+# --------------------------------------------------
+def test_positions() -> None:
+    """ Writes the mismatch positions for files and strings """
+
+    for seqs in [f'{SEQ1} {SEQ2}', 'GAGCCTACTAACGGGAT CATCGTAATGACGGCCT']:
+        fd, out_file = tempfile.mkstemp()
+        os.close(fd)
+        try:
+            rv, out = getstatusoutput(f'{RUN} -p {out_file} {seqs}')
+            assert rv == 0
+            assert out == '7'
+            with open(out_file, encoding='utf-8') as fh:
+                assert fh.read().split() == [
+                    '1', '3', '5', '8', '10', '15', '16'
+                ]
+        finally:
+            os.remove(out_file)
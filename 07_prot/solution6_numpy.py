@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+""" Translate RNA to proteins """
+
+import argparse
+import io
+import os
+import sys
+import time
+from collections import deque
+from functools import lru_cache
+from itertools import product
+from multiprocessing import Pool
+from typing import (Any, BinaryIO, Callable, Deque, Dict, Iterable, Iterator,
+                    List, NamedTuple, Optional, Tuple)
+
+CODON_TO_AA = {
+    'AAA': 'K', 'AAC': 'N', 'AAG': 'K', 'AAU': 'N', 'ACA': 'T',
+    'ACC': 'T', 'ACG': 'T', 'ACU': 'T', 'AGA': 'R', 'AGC': 'S',
+    'AGG': 'R', 'AGU': 'S', 'AUA': 'I', 'AUC': 'I', 'AUG': 'M',
+    'AUU': 'I', 'CAA': 'Q', 'CAC': 'H', 'CAG': 'Q', 'CAU': 'H',
+    'CCA': 'P', 'CCC': 'P', 'CCG': 'P', 'CCU': 'P', 'CGA': 'R',
+    'CGC': 'R', 'CGG': 'R', 'CGU': 'R', 'CUA': 'L', 'CUC': 'L',
+    'CUG': 'L', 'CUU': 'L', 'GAA': 'E', 'GAC': 'D', 'GAG': 'E',
+    'GAU': 'D', 'GCA': 'A', 'GCC': 'A', 'GCG': 'A', 'GCU': 'A',
+    'GGA': 'G', 'GGC': 'G', 'GGG': 'G', 'GGU': 'G', 'GUA': 'V',
+    'GUC': 'V', 'GUG': 'V', 'GUU': 'V', 'UAC': 'Y', 'UAU': 'Y',
+    'UCA': 'S', 'UCC': 'S', 'UCG': 'S', 'UCU': 'S', 'UGC': 'C',
+    'UGG': 'W', 'UGU': 'C', 'UUA': 'L', 'UUC': 'F', 'UUG': 'L',
+    'UUU': 'F', 'UAA': '*', 'UAG': '*', 'UGA': '*',
+}
+
+BASES = 'ACGU'
+
+STOP = ord('*')
+
+# Send records to the workers in batches of about this many bases
+BATCH_SIZE = 4 * 1024 * 1024
+
+# Command-line strings shorter than this translate faster in plain Python
+# than it takes to import numpy
+SHORT_SEQ = 100000
+
+
+class Args(NamedTuple):
+    """ Command-line arguments """
+    rna: str
+    format: str
+    workers: int
+
+
+class Record(NamedTuple):
+    """ A FASTA or FASTQ record """
+    id: bytes
+    seq: bytes
+
+
+# --------------------------------------------------
+def get_args() -> Args:
+    """ Get command-line arguments """
+
+    parser = argparse.ArgumentParser(
+        description='Translate RNA to proteins',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+
+    parser.add_argument('rna',
+                        type=str,
+                        metavar='RNA',
+                        help='RNA sequence or FASTA/FASTQ file')
+
+    parser.add_argument('-f',
+                        '--format',
+                        metavar='format',
+                        choices=['fasta', 'fastq'],
+                        default='fasta',
+                        help='Input file format')
+
+    parser.add_argument('-w',
+                        '--workers',
+                        metavar='int',
+                        type=int,
+                        default=1,
+                        help='Number of worker processes for a file')
+
+    args = parser.parse_args()
+
+    if args.workers < 1:
+        parser.error(f'--workers "{args.workers}" must be greater than 0')
+
+    return Args(args.rna, args.format, args.workers)
+
+
+# --------------------------------------------------
+def main() -> None:
+    """ Make a jazz noise here """
+
+    args = get_args()
+
+    if not os.path.isfile(args.rna):
+        print(translate_short(args.rna) if len(args.rna) < SHORT_SEQ else
+              translate(args.rna.encode()).decode())
+        return
+
+    start = time.perf_counter()
+    with open(args.rna, 'rb') as fh:
+        num_recs, num_bases = translate_file(READERS[args.format](fh),
+                                             sys.stdout.buffer, args.workers)
+    secs = max(time.perf_counter() - start, 1e-9)
+
+    print(f'Translated {num_recs:,} record{"" if num_recs == 1 else "s"}, '
+          f'{num_bases:,} bases in {secs:.2f}s '
+          f'({num_recs / secs:,.0f} records/s, {num_bases / secs:,.0f} '
+          'bases/s).',
+          file=sys.stderr)
+
+
+# --------------------------------------------------
+@lru_cache(maxsize=None)
+def tables() -> Tuple[Any, Any]:
+    """ Lookup tables for the bases and codons, made on first use """
+
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    # Codes for the bases, T is read as U, anything else is 4
+    codes = np.full(256, 4, dtype=np.uint8)
+    for code, base in enumerate(BASES):
+        codes[ord(base)] = codes[ord(base.lower())] = code
+    codes[ord('T')] = codes[ord('t')] = BASES.index('U')
+
+    # The amino acid for codon index 25 * first + 5 * second + third,
+    # the extra code 4 makes any codon with another base unknown
+    aa_table = np.full(125, ord('-'), dtype=np.uint8)
+    for first, second, third in product(range(4), repeat=3):
+        aa_table[25 * first + 5 * second + third] = ord(
+            CODON_TO_AA[BASES[first] + BASES[second] + BASES[third]])
+
+    return codes, aa_table
+
+
+# --------------------------------------------------
+def translate_short(rna: str) -> str:
+    """ Translate a short sequence without numpy, just like translate() """
+
+    rna = rna.upper().replace('T', 'U')
+    protein = ''.join(
+        CODON_TO_AA.get(rna[i:i + 3], '-') for i in range(0, len(rna), 3))
+    return protein.partition('*')[0]
+
+
+# --------------------------------------------------
+def test_translate_short() -> None:
+    """ Test translate_short """
+
+    for rna in [
+            '', 'AUG', 'aug', 'ATG', 'AUGCCGUAAUCU', 'AUGNNNCC', 'UAAAUG',
+            'AUGUG', 'AUGGCCAUGGCGCCCAGAACUGAGAUCAAUAGUACCCGUAUUAACGGGUGA'
+    ]:
+        assert translate_short(rna) == translate(rna.encode()).decode()
+
+
+# --------------------------------------------------
+def translate(rna: bytes) -> bytes:
+    """ Translate up to the first stop codon """
+
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    codes_table, aa_table = tables()
+    codes = codes_table[np.frombuffer(rna, dtype=np.uint8)]
+    end = len(codes) // 3 * 3
+
+    # The codon indices fit in uint8, so this makes no wide temporaries
+    index = codes[0:end:3] * np.uint8(25)
+    index += codes[1:end:3] * np.uint8(5)
+    index += codes[2:end:3]
+    protein = aa_table[index]
+
+    # argmax() finds the first True
+    stops = protein == STOP
+    if stops.any():
+        return protein[:stops.argmax()].tobytes()
+
+    # A partial codon at the end is unknown, too
+    return protein.tobytes() + (b'-' if len(codes) % 3 else b'')
+
+
+# --------------------------------------------------
+def test_translate() -> None:
+    """ Test translate """
+
+    assert translate(b'') == b''
+    assert translate(b'AUG') == b'M'
+    assert translate(b'aug') == b'M'
+    assert translate(b'ATG') == b'M'
+    assert translate(b'AUGCCGUAAUCU') == b'MP'
+    assert translate(b'AUGGCCAUGGCGCCCAGAACUGAGAU'
+                     b'CAAUAGUACCCGUAUUAACGGGUGA') == b'MAMAPRTEINSTRING'
+    assert translate(b'AUGNNNCC') == b'M--'
+    assert translate(b'UAAAUG') == b''
+    assert translate(b'AUGUG') == b'M-'
+
+
+# --------------------------------------------------
+def translate_many(seqs: List[bytes]) -> List[bytes]:
+    """ Translate many sequences at once, each up to its first stop codon """
+
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    codes_table, aa_table = tables()
+
+    # Pad each sequence to whole codons, so every one starts in frame
+    # and a partial codon at the end becomes unknown
+    padded = b''.join(seq + b'N' * (-len(seq) % 3) for seq in seqs)
+    num_codons = np.array([-(-len(seq) // 3) for seq in seqs], dtype=np.int64)
+    first_codon = np.cumsum(num_codons) - num_codons
+
+    codes = codes_table[np.frombuffer(padded, dtype=np.uint8)]
+    index = codes[0::3] * np.uint8(25)
+    index += codes[1::3] * np.uint8(5)
+    index += codes[2::3]
+    protein = aa_table[index]
+
+    # The first stop codon at or after the start of each sequence
+    stops = np.append(np.flatnonzero(protein == STOP), len(protein))
+    ends = np.minimum(stops[np.searchsorted(stops, first_codon)],
+                      first_codon + num_codons)
+
+    out = protein.tobytes()
+    return [
+        out[start:end]
+        for start, end in zip(first_codon.tolist(), ends.tolist())
+    ]
+
+
+# --------------------------------------------------
+def test_translate_many() -> None:
+    """ Test translate_many """
+
+    assert translate_many([]) == []
+    seqs = [
+        b'', b'AUG', b'AUGCCGUAAUCU', b'AUGNNNCC', b'UAAAUG', b'AUGUG',
+        b'UGA', b'CCCUGAUAG'
+    ]
+    assert translate_many(seqs) == [translate(seq) for seq in seqs]
+
+
+# --------------------------------------------------
+def read_fasta(fh: BinaryIO) -> Iterator[Record]:
+    """ Read FASTA records, the ID is the first word of the header """
+
+    rec_id: Optional[bytes] = None
+    lines: List[bytes] = []
+
+    for line in fh:
+        line = line.rstrip()
+        if line.startswith(b'>'):
+            if rec_id is not None:
+                yield Record(rec_id, b''.join(lines))
+            words = line[1:].split(None, 1)
+            rec_id, lines = (words[0] if words else b''), []
+        elif line and rec_id is not None:
+            lines.append(line)
+
+    if rec_id is not None:
+        yield Record(rec_id, b''.join(lines))
+
+
+# --------------------------------------------------
+def test_read_fasta() -> None:
+    """ Test read_fasta """
+
+    assert not list(read_fasta(io.BytesIO(b'')))
+    fasta = b'>a desc\nAUG\nUAA\n>b\n\n>\r\nAU\r\nG'
+    assert list(read_fasta(io.BytesIO(fasta))) == [
+        Record(b'a', b'AUGUAA'),
+        Record(b'b', b''),
+        Record(b'', b'AUG'),
+    ]
+
+
+# --------------------------------------------------
+def read_fastq(fh: BinaryIO) -> Iterator[Record]:
+    """ Read four-line FASTQ records, skipping the quality scores """
+
+    while header := fh.readline():
+        if not header.strip():
+            continue
+
+        seq = fh.readline().rstrip()
+        fh.readline()
+        fh.readline()
+        words = header[1:].split(None, 1)
+        yield Record(words[0] if words else b'', seq)
+
+
+# --------------------------------------------------
+def test_read_fastq() -> None:
+    """ Test read_fastq """
+
+    assert not list(read_fastq(io.BytesIO(b'')))
+    fastq = b'@a desc\nAUGUAA\n+\nIIIIII\n@b\nAUG\n+b\n@@@\n\n'
+    assert list(read_fastq(io.BytesIO(fastq))) == [
+        Record(b'a', b'AUGUAA'),
+        Record(b'b', b'AUG'),
+    ]
+
+
+READERS: Dict[str, Callable[[BinaryIO], Iterator[Record]]] = {
+    'fasta': read_fasta,
+    'fastq': read_fastq,
+}
+
+
+# --------------------------------------------------
+def format_batch(batch: List[Record]) -> bytes:
+    """ Translate a batch of records into FASTA """
+
+    proteins = translate_many([rec.seq for rec in batch])
+    return b''.join(b'>' + rec.id + b'\n' + protein + b'\n'
+                    for rec, protein in zip(batch, proteins))
+
+
+# --------------------------------------------------
+def test_format_batch() -> None:
+    """ Test format_batch """
+
+    assert format_batch([]) == b''
+    assert format_batch([Record(b'a', b'AUGCCGUAAUCU'),
+                         Record(b'b', b'')]) == b'>a\nMP\n>b\n\n'
+
+
+# --------------------------------------------------
+def translate_file(records: Iterable[Record],
+                   out_fh: BinaryIO,
+                   workers: int = 1,
+                   size: int = BATCH_SIZE) -> Tuple[int, int]:
+    """ Translate records in order, return the numbers of records and bases """
+
+    num_recs = num_bases = 0
+
+    def jobs() -> Iterator[List[Record]]:
+        """ Group records into batches of about "size" bases, counting them """
+
+        nonlocal num_recs, num_bases
+        batch: List[Record] = []
+        batch_bases = 0
+        for rec in records:
+            # A record longer than "size" is a batch by itself
+            if batch and batch_bases + len(rec.seq) > size:
+                yield batch
+                batch, batch_bases = [], 0
+            batch.append(rec)
+            batch_bases += len(rec.seq)
+            num_recs += 1
+            num_bases += len(rec.seq)
+
+        if batch:
+            yield batch
+
+    if workers == 1:
+        for batch in jobs():
+            out_fh.write(format_batch(batch))
+        return num_recs, num_bases
+
+    # Pool.imap() would read the whole file ahead of the workers, so queue
+    # at most two batches per worker and write the oldest as it finishes
+    with Pool(workers) as pool:
+        queued: Deque = deque()
+        for batch in jobs():
+            queued.append(pool.apply_async(format_batch, (batch, )))
+            if len(queued) == 2 * workers:
+                out_fh.write(queued.popleft().get())
+
+        for result in queued:
+            out_fh.write(result.get())
+
+    return num_recs, num_bases
+
+
+# --------------------------------------------------
+def test_translate_file() -> None:
+    """ Test translate_file """
+
+    recs = [Record(b'a', b'AUGCCGUAAUCU'), Record(b'b', b'AUGG'),
+            Record(b'c', b'UUU')]
+    for workers in [1, 2]:
+        out_fh = io.BytesIO()
+        assert translate_file(recs, out_fh, workers, 4) == (3, 19)
+        assert out_fh.getvalue() == b'>a\nMP\n>b\nM-\n>c\nF\n'
+
+    # More batches than fit in the queue, batches of one and of two records
+    recs = [Record(str(i).encode(), b'AUG' * (i % 3)) for i in range(20)]
+    expected = b''.join(b'>%d\n%s\n' % (i, b'M' * (i % 3)) for i in range(20))
+    for workers, size in [(1, 3), (2, 3), (2, 6)]:
+        out_fh = io.BytesIO()
+        assert translate_file(recs, out_fh, workers, size) == (20, 57)
+        assert out_fh.getvalue() == expected
+
+
+# --------------------------------------------------
+if __name__ == '__main__':
+    main()
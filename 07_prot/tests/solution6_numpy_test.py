@@ -0,0 +1,55 @@
+""" Tests for the options only solution6_numpy.py has """
+
+import platform
+import re
+import subprocess
+import sys
+
+PRG = './solution6_numpy.py'
+RUN = [sys.executable, PRG] if platform.system() == 'Windows' else [PRG]
+FASTA = './tests/inputs/input1.fa'
+FASTQ = './tests/inputs/input1.fq'
+PROTEINS = '>seq1\nMAMAPRTEINSTRING\n>seq2\nMP\n'
+
+
+# --------------------------------------------------
+def run(*args: str) -> subprocess.CompletedProcess:
+    """ Run the program, keeping STDOUT and STDERR apart """
+
+    return subprocess.run(RUN + list(args),
+                          capture_output=True,
+                          text=True,
+                          check=False)
+
+
+# --------------------------------------------------
+def test_fasta() -> None:
+    """ Translates each FASTA record, stats go to STDERR """
+
+    for workers in ['1', '2']:
+        proc = run('-w', workers, FASTA)
+        assert proc.returncode == 0
+        assert proc.stdout == PROTEINS
+        assert re.match(r'Translated 2 records, 63 bases in \d+\.\d\ds ',
+                        proc.stderr)
+
+
+# --------------------------------------------------
+def test_fastq() -> None:
+    """ Translates each FASTQ record """
+
+    for workers in ['1', '2']:
+        proc = run('--format', 'fastq', '-w', workers, FASTQ)
+        assert proc.returncode == 0
+        assert proc.stdout == PROTEINS
+        assert proc.stderr.startswith('Translated 2 records, 63 bases')
+
+
+# --------------------------------------------------
+def test_bad_workers() -> None:
+    """ Dies on bad --workers """
+
+    proc = run('-w', '0', FASTA)
+    assert proc.returncode != 0
+    assert proc.stderr.lower().startswith('usage:')
+    assert '--workers "0" must be greater than 0' in proc.stderr
@@ -2,9 +2,15 @@
 """ Generate long sequences """
 
 import argparse
-import numpy as np
-import random
-from typing import NamedTuple, TextIO
+import os
+import sys
+from typing import BinaryIO, NamedTuple, Optional
+
+# bin/ is not a package, so put it on the path to share seqgen.py
+sys.path.append(
+    os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', 'bin'))
+from seqgen import (  # noqa: E402 pylint: disable=E0401,C0413
+    Spec, generate, make_motif)
 
 
 class Args(NamedTuple):
@@ -13,7 +19,9 @@ class Args(NamedTuple):
     seq_len: int
     num_seqs: int
     sigma: float
-    out_file: TextIO
+    out_file: BinaryIO
+    seed: Optional[int]
+    workers: int
 
 
 # --------------------------------------------------
@@ -56,12 +64,29 @@ def get_args() -> Args:
                         '--outfile',
                         help='Output file',
                         metavar='FILE',
-                        type=argparse.FileType('wt'),
+                        type=argparse.FileType('wb'),
                         default='seqs.fa')
 
+    parser.add_argument('--seed',
+                        help='Random seed',
+                        metavar='int',
+                        type=int,
+                        default=None)
+
+    parser.add_argument('-w',
+                        '--workers',
+                        help='Number of worker processes',
+                        metavar='int',
+                        type=int,
+                        default=1)
+
     args = parser.parse_args()
 
-    return Args(args.motif_len, args.len, args.num, args.sigma, args.outfile)
+    if args.workers < 1:
+        parser.error(f'--workers "{args.workers}" must be greater than 0')
+
+    return Args(args.motif_len, args.len, args.num, args.sigma, args.outfile,
+                args.seed, args.workers)
 
 
 # --------------------------------------------------
@@ -69,16 +94,14 @@ def main() -> None:
     """ Make a jazz noise here """
 
     args = get_args()
-    motif_len = args.motif_len
-    motif = ''.join([random.choice('ACGT') for _ in range(motif_len)])
-    print(f'Common motif is "{motif}".')
-
-    for i in range(args.num_seqs):
-        seq_len = int(np.random.normal(args.seq_len, args.sigma))
-        seq = ''.join([random.choice('ACGT') for _ in range(seq_len)])
-        pos = random.randint(1, seq_len)
-        seq = seq[:pos] + motif + seq[pos + motif_len:] # inject motif
-        args.out_file.write(f'>SEQ{i}\n{seq}\n')
+    motif = make_motif(args.motif_len, args.seed)
+    print(f'Common motif is "{motif.decode()}".')
+
+    generate(args.out_file,
+             args.num_seqs,
+             Spec(args.seq_len, sigma=args.sigma, fasta=True, motif=motif),
+             seed=args.seed,
+             workers=args.workers)
 
     print(f'Wrote {args.num_seqs:,} sequences of avg length {args.seq_len:,} '
           f'to "{args.out_file.name}".')
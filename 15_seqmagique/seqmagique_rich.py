@@ -2,7 +2,7 @@
 """ Mimic seqmagick, print stats on FASTA sequences """
 
 import argparse
-import numpy as np
+import statistics
 from typing import List, NamedTuple, TextIO
 from rich.console import Console
 from rich.progress import track
@@ -72,7 +72,7 @@ def process(fh: TextIO) -> FastaInfo:
         return FastaInfo(filename=fh.name,
                          min_len=min(lengths),
                          max_len=max(lengths),
-                         avg_len=round(np.mean(lengths), 2),
+                         avg_len=round(statistics.fmean(lengths), 2),
                          num_seqs=len(lengths))
 
     return FastaInfo(filename=fh.name,
@@ -2,8 +2,8 @@
 """ Mimic seqmagick """
 
 import argparse
+import statistics
 from typing import List, NamedTuple, TextIO
-import numpy as np
 from tabulate import tabulate
 from Bio import SeqIO
 
@@ -71,7 +71,7 @@ def process(fh: TextIO) -> FastaInfo:
         return FastaInfo(filename=fh.name,
                          min_len=min(lengths),
                          max_len=max(lengths),
-                         avg_len=round(float(np.mean(lengths)), 2),
+                         avg_len=round(statistics.fmean(lengths), 2),
                          num_seqs=len(lengths))
 
     return FastaInfo(filename=fh.name,
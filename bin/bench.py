@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+""" Benchmark the solution*.py programs in-process """
+
+import argparse
+import importlib.util
+import json
+import multiprocessing
+import os
+import random
+import re
+import resource
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, TextIO
+
+ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+# Write generated inputs in blocks of this many bytes
+BLOCK = 8 * 1024 * 1024
+
+SENSE_CODONS = [
+    c for c in (a + b + c for a in 'ACGU' for b in 'ACGU' for c in 'ACGU')
+    if c not in ('UAA', 'UAG', 'UGA')
+]
+
+
+class Chapter(NamedTuple):
+    """ How to build the input and arguments for one chapter """
+    make_input: Callable[[str, int, int], None]
+    argv: Callable[[str, str, int], List[str]]
+    unit: str = 'bytes'
+    sizes: Optional[List[int]] = None
+
+
+class Args(NamedTuple):
+    """ Command-line arguments """
+    chapters: List[str]
+    sizes: List[int]
+    number: int
+    seed: int
+    outfile: TextIO
+
+
+# --------------------------------------------------
+def get_args() -> Args:
+    """ Get command-line arguments """
+
+    parser = argparse.ArgumentParser(
+        description='Benchmark the solution*.py programs in-process',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+
+    parser.add_argument('chapter',
+                        metavar='chapter',
+                        nargs='*',
+                        default=sorted(CHAPTERS),
+                        help='Chapters to benchmark (e.g., 01_dna or 01)')
+
+    parser.add_argument('-s',
+                        '--sizes',
+                        metavar='sizes',
+                        type=str,
+                        default='1K,1M',
+                        help='Comma-separated input sizes (K, M, G)')
+
+    parser.add_argument('-n',
+                        '--number',
+                        metavar='int',
+                        type=int,
+                        default=3,
+                        help='Number of runs per input, the fastest is kept')
+
+    parser.add_argument('--seed',
+                        metavar='int',
+                        type=int,
+                        default=1,
+                        help='Random seed for the generated inputs')
+
+    parser.add_argument('-o',
+                        '--outfile',
+                        metavar='FILE',
+                        type=argparse.FileType('wt'),
+                        default='bench.json',
+                        help='JSON output file')
+
+    args = parser.parse_args()
+
+    chapters = []
+    for chapter in args.chapter:
+        matches = [name for name in CHAPTERS if name.startswith(chapter)]
+        if not matches:
+            parser.error(f'Unknown chapter "{chapter}"')
+        chapters.extend(matches)
+
+    try:
+        sizes = list(map(parse_size, args.sizes.split(',')))
+    except ValueError as err:
+        parser.error(str(err))
+
+    if args.number < 1:
+        parser.error(f'--number "{args.number}" must be greater than 0')
+
+    return Args(chapters, sizes, args.number, args.seed, args.outfile)
+
+
+# --------------------------------------------------
+def main() -> None:
+    """ Make a jazz noise here """
+
+    args = get_args()
+    results: List[Dict[str, Any]] = []
+
+    # Use fresh interpreters so imports and peak RSS are not shared
+    ctx = multiprocessing.get_context('spawn')
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for chapter_name in args.chapters:
+            chapter = CHAPTERS[chapter_name]
+            chapter_dir = os.path.join(ROOT, chapter_name)
+            solutions = sorted(
+                filter(re.compile(r'solution.*\.py$').match,
+                       os.listdir(chapter_dir)))
+
+            for size in chapter.sizes or args.sizes:
+                path = os.path.join(tmp_dir, f'{chapter_name}.{size}')
+                chapter.make_input(path, size, args.seed)
+
+                for solution in solutions:
+                    with ctx.Pool(1) as pool:
+                        result = pool.apply(
+                            run,
+                            (chapter_name, solution, path, size, args.number))
+
+                    results.append(result)
+                    print(format_result(result), flush=True)
+
+                if os.path.isfile(path):
+                    os.remove(path)
+
+    json.dump(results, args.outfile, indent=2)
+    print(f'Done, see "{args.outfile.name}".')
+
+
+# --------------------------------------------------
+def run(chapter_name: str, solution: str, path: str, size: int,
+        number: int) -> Dict[str, Any]:
+    """ Import a solution and time its main() on one input """
+
+    chapter = CHAPTERS[chapter_name]
+    chapter_dir = os.path.join(ROOT, chapter_name)
+    result: Dict[str, Any] = {
+        'chapter': chapter_name,
+        'solution': solution,
+        'size': size,
+        'unit': chapter.unit,
+    }
+
+    os.chdir(chapter_dir)
+    sys.path.insert(0, chapter_dir)
+    out_dir = tempfile.mkdtemp(dir=os.path.dirname(path))
+
+    try:
+        spec = importlib.util.spec_from_file_location(
+            os.path.splitext(solution)[0], os.path.join(chapter_dir, solution))
+        assert spec and spec.loader
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        argv = [solution] + chapter.argv(path, out_dir, size)
+
+        # Count only the memory main() adds to the interpreter and imports
+        baseline = rss()
+        times = []
+        with open(os.devnull, 'wt', encoding='utf-8') as devnull, \
+                redirect_stdout(devnull):
+            for _ in range(number):
+                sys.argv = argv
+                start = time.perf_counter()
+                module.main()
+                times.append(time.perf_counter() - start)
+
+        seconds = min(times)
+        result.update({
+            'seconds': seconds,
+            'throughput': size / seconds if seconds else 0.,
+            'peak_rss': max(0, rss('VmHWM') - baseline),
+        })
+    except (Exception, SystemExit) as err:  # pylint: disable=broad-except
+        result['error'] = f'{type(err).__name__}: {err}'
+
+    return result
+
+
+# --------------------------------------------------
+def rss(field: str = 'VmRSS') -> int:
+    """ Current (VmRSS) or peak (VmHWM) resident set size in bytes """
+
+    # On Linux, ru_maxrss can include the parent process from before the
+    # exec, but VmHWM starts over for the new program
+    if os.path.isfile('/proc/self/status'):
+        with open('/proc/self/status', 'rt', encoding='utf-8') as fh:
+            for line in fh:
+                if line.startswith(f'{field}:'):
+                    return int(line.split()[1]) * 1024
+
+    # Elsewhere only the peak is known, which is close to the current size
+    # before main() has run
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss if sys.platform == 'darwin' else maxrss * 1024
+
+
+# --------------------------------------------------
+def format_result(result: Dict[str, Any]) -> str:
+    """ Format one result for the terminal """
+
+    name = f'{result["chapter"]}/{result["solution"]}'
+    size = f'{result["size"]:,} {result["unit"]}'
+
+    if 'error' in result:
+        return f'{name:50} {size:>22} {result["error"]}'
+
+    return (f'{name:50} {size:>22} {result["seconds"]:10.4f}s '
+            f'{result["throughput"]:14,.0f}/s '
+            f'{result["peak_rss"] / 2**20:8.1f} MiB')
+
+
+# --------------------------------------------------
+def parse_size(size: str) -> int:
+    """ Parse a size like "1K" or "10M" into a number of bytes """
+
+    match = re.match(r'^(\d+)([KMG]?)B?$', size.strip().upper())
+    if not match:
+        raise ValueError(f'Invalid size "{size}"')
+
+    num, unit = match.groups()
+    return int(num) * {'': 1, 'K': 2**10, 'M': 2**20, 'G': 2**30}[unit]
+
+
+# --------------------------------------------------
+def test_parse_size() -> None:
+    """ Test parse_size """
+
+    assert parse_size('10') == 10
+    assert parse_size('1K') == 1024
+    assert parse_size('2m') == 2 * 1024 * 1024
+    assert parse_size('1GB') == 1024**3
+
+    try:
+        parse_size('1T')
+        assert False
+    except ValueError:
+        pass
+
+
+# --------------------------------------------------
+def random_seq(rng: random.Random, n: int, alphabet: str = 'ACGT') -> str:
+    """ Generate a random sequence """
+
+    # Map every byte value to a base in one pass instead of choice() per base
+    table = bytes(ord(alphabet[i % len(alphabet)]) for i in range(256))
+    return rng.getrandbits(8 * n).to_bytes(n, 'little').translate(
+        table).decode() if n > 0 else ''
+
+
+# --------------------------------------------------
+def test_random_seq() -> None:
+    """ Test random_seq """
+
+    assert random_seq(random.Random(1), 0) == ''
+    assert len(random_seq(random.Random(1), 100)) == 100
+    assert set(random_seq(random.Random(1), 100, 'AC')) == {'A', 'C'}
+    assert random_seq(random.Random(1), 10) == random_seq(random.Random(1), 10)
+
+
+# --------------------------------------------------
+def write_lines(path: str, size: int, seed: int, width: int = 1000,
+                header: bool = False) -> None:
+    """ Write about "size" bytes of random DNA in lines, maybe as FASTA """
+
+    rng = random.Random(seed)
+    with open(path, 'wt', encoding='utf-8') as fh:
+        written, rec_num = 0, 0
+        while written < size:
+            seq = random_seq(rng, min(width, size - written))
+            written += len(seq)
+            if header:
+                rec_num += 1
+                fh.write(f'>SEQ{rec_num}\n')
+            fh.write(seq + '\n')
+
+
+# --------------------------------------------------
+def write_seq(path: str, size: int, seed: int, num: int = 1) -> None:
+    """ Write "num" random DNA sequences of "size" bases, one per line """
+
+    rng = random.Random(seed)
+    with open(path, 'wt', encoding='utf-8') as fh:
+        for _ in range(num):
+            for start in range(0, size, BLOCK):
+                fh.write(random_seq(rng, min(BLOCK, size - start)))
+            fh.write('\n')
+
+
+# --------------------------------------------------
+def write_rna(path: str, size: int, seed: int) -> None:
+    """ Write an RNA open reading frame of about "size" bases """
+
+    # Write whole codons and no stop codons, so every solution translates
+    # the whole input
+    size -= size % 3
+    with open(path, 'wt', encoding='utf-8') as fh:
+        if size < 3:
+            fh.write('\n')
+            return
+
+        rng = random.Random(seed)
+        block = ''.join(rng.choices(SENSE_CODONS, k=BLOCK // 3))
+        fh.write('AUG')
+        for start in range(3, size, len(block)):
+            fh.write(block[:size - start])
+        fh.write('\n')
+
+
+# --------------------------------------------------
+def test_write_rna() -> None:
+    """ Test write_rna """
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'rna')
+        for size in [0, 2]:
+            write_rna(path, size, 1)
+            assert not read_seqs(path)
+
+        for size in [3, 100, 101, 102]:
+            write_rna(path, size, 1)
+            rna = read_seqs(path)[0]
+            assert len(rna) == size - size % 3
+            codons = [rna[i:i + 3] for i in range(0, len(rna), 3)]
+            assert codons[0] == 'AUG'
+            assert set(codons) <= set(SENSE_CODONS)
+
+
+# --------------------------------------------------
+def read_seqs(path: str) -> List[str]:
+    """ Read the sequences written by write_seq() """
+
+    with open(path, 'rt', encoding='utf-8') as fh:
+        return fh.read().split()
+
+
+# --------------------------------------------------
+def no_input(*_: Any) -> None:
+    """ For chapters such as 04_fib that take no input file """
+
+
+CHAPTERS: Dict[str, Chapter] = {
+    '01_dna':
+    Chapter(write_seq, lambda path, out_dir, size: [path]),
+    '02_rna':
+    Chapter(write_lines, lambda path, out_dir, size: [path, '-o', out_dir]),
+    '03_revc':
+    Chapter(write_seq, lambda path, out_dir, size: [path]),
+    '04_fib':
+    Chapter(no_input,
+            lambda path, out_dir, size: [str(size), '3'],
+            unit='generations',
+            sizes=[10, 20, 30]),
+    '05_gc':
+    Chapter(lambda path, size, seed: write_lines(path, size, seed, 500, True),
+            lambda path, out_dir, size: [path]),
+    '06_hamm':
+    Chapter(lambda path, size, seed: write_seq(path, size, seed, 2),
+            lambda path, out_dir, size: read_seqs(path)),
+    '07_prot':
+    Chapter(write_rna, lambda path, out_dir, size: read_seqs(path)),
+    '08_subs':
+    Chapter(write_seq, lambda path, out_dir, size: read_seqs(path) + ['ATAT']),
+}
+
+
+# --------------------------------------------------
+if __name__ == '__main__':
+    main()
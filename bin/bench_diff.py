@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+""" Compare two bench.py runs and flag regressions """
+
+import argparse
+import json
+import sys
+from typing import Any, Dict, NamedTuple, TextIO, Tuple
+
+Key = Tuple[str, str, int]
+RSS_FLOOR = 1024 * 1024
+
+
+class Args(NamedTuple):
+    """ Command-line arguments """
+    old: TextIO
+    new: TextIO
+    threshold: float
+
+
+# --------------------------------------------------
+def get_args() -> Args:
+    """ Get command-line arguments """
+
+    parser = argparse.ArgumentParser(
+        description='Compare two bench.py runs and flag regressions',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+
+    parser.add_argument('old',
+                        metavar='OLD',
+                        type=argparse.FileType('rt'),
+                        help='Baseline JSON from bench.py')
+
+    parser.add_argument('new',
+                        metavar='NEW',
+                        type=argparse.FileType('rt'),
+                        help='New JSON from bench.py')
+
+    parser.add_argument('-t',
+                        '--threshold',
+                        metavar='float',
+                        type=float,
+                        default=0.1,
+                        help='Allowed fractional slowdown or RSS growth '
+                        '(RSS growth under 1 MiB is never flagged)')
+
+    args = parser.parse_args()
+
+    if args.threshold < 0:
+        parser.error(f'--threshold "{args.threshold}" must be positive')
+
+    return Args(args.old, args.new, args.threshold)
+
+
+# --------------------------------------------------
+def main() -> None:
+    """ Make a jazz noise here """
+
+    args = get_args()
+    old = index(json.load(args.old))
+    new = index(json.load(args.new))
+    num_regressions = 0
+
+    for key in sorted(set(old) & set(new)):
+        flags = regressions(old[key], new[key], args.threshold)
+        num_regressions += len(flags) > 0
+        chapter, solution, size = key
+        print(f'{chapter + "/" + solution:50} {size:>14,} '
+              f'{old[key].get("seconds", 0):10.4f}s '
+              f'{new[key].get("seconds", 0):10.4f}s '
+              f'{change(old[key], new[key], "seconds"):>+8.1%} '
+              f'{", ".join(flags)}')
+
+    if unmatched := len(set(old) ^ set(new)):
+        print(f'Skipped {unmatched} result{"" if unmatched == 1 else "s"} '
+              'found in only one run.')
+
+    print(f'{num_regressions} regression{"" if num_regressions == 1 else "s"}'
+          f' above {args.threshold:.0%}.')
+
+    sys.exit(1 if num_regressions else 0)
+
+
+# --------------------------------------------------
+def index(results: list) -> Dict[Key, Dict[str, Any]]:
+    """ Index the results of a run by chapter, solution, and size """
+
+    return {(r['chapter'], r['solution'], r['size']): r for r in results}
+
+
+# --------------------------------------------------
+def change(old: Dict[str, Any], new: Dict[str, Any], field: str) -> float:
+    """ Fractional change of a field between two results """
+
+    if not old.get(field) or not new.get(field):
+        return 0.
+
+    return new[field] / old[field] - 1
+
+
+# --------------------------------------------------
+def test_change() -> None:
+    """ Test change """
+
+    assert change({'seconds': 2.}, {'seconds': 3.}, 'seconds') == .5
+    assert change({'seconds': 2.}, {'seconds': 1.}, 'seconds') == -.5
+    assert change({}, {'seconds': 1.}, 'seconds') == 0.
+
+
+# --------------------------------------------------
+def regressions(old: Dict[str, Any], new: Dict[str, Any],
+                threshold: float) -> list:
+    """ Describe how a new result is worse than the old """
+
+    flags = []
+    if 'error' in new and 'error' not in old:
+        flags.append('ERROR')
+
+    if change(old, new, 'seconds') > threshold:
+        flags.append('SLOWER')
+
+    # A small interpreter allocation can be a large fraction of a tiny peak
+    if change(old, new, 'peak_rss') > threshold and \
+            new['peak_rss'] - old['peak_rss'] >= RSS_FLOOR:
+        flags.append('BIGGER')
+
+    return flags
+
+
+# --------------------------------------------------
+def test_regressions() -> None:
+    """ Test regressions """
+
+    old = {'seconds': 1., 'peak_rss': 4 * RSS_FLOOR}
+    assert not regressions(old, old, .1)
+    assert not regressions(old, {'seconds': 1.05, 'peak_rss': 4 * RSS_FLOOR},
+                           .1)
+    assert regressions(old, {
+        'seconds': 2.,
+        'peak_rss': 4 * RSS_FLOOR
+    }, .1) == ['SLOWER']
+    assert regressions(old, {
+        'seconds': .5,
+        'peak_rss': 8 * RSS_FLOOR
+    }, .1) == ['BIGGER']
+    assert not regressions({
+        'seconds': 1.,
+        'peak_rss': 100
+    }, {
+        'seconds': 1.,
+        'peak_rss': 200
+    }, .1)
+    assert regressions(old, {'error': 'ValueError'}, .1) == ['ERROR']
+
+
+# --------------------------------------------------
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,180 @@
+""" Fast random sequence generation shared by the genseq.py programs
+
+The genseq.py scripts are run in place from their chapter directories, not
+installed, so each one appends this bin/ directory to sys.path before it
+imports this module. Keep this module free of imports from the chapters.
+"""
+
+import io
+from functools import partial
+from multiprocessing import Pool
+from typing import BinaryIO, Iterator, NamedTuple, Optional
+import numpy as np
+
+# Aim for batches of about this many bases
+BATCH_BASES = 16 * 1024 * 1024
+
+# spawn() numbers the batch seeds from 0, the motif's key is out of reach
+MOTIF_KEY = (2**32, )
+
+
+class Batch(NamedTuple):
+    """ A range of records generated from one seed """
+    first: int
+    num_seqs: int
+    seed: np.random.SeedSequence
+
+
+class Spec(NamedTuple):
+    """ What to generate """
+    seq_len: int
+    sigma: float = 0.
+    fasta: bool = False
+    motif: bytes = b''
+    alphabet: bytes = b'ACGT'
+
+
+# --------------------------------------------------
+def random_seq(rng: np.random.Generator,
+               n: int,
+               alphabet: bytes = b'ACGT') -> np.ndarray:
+    """ Draw n random bases as an array of ASCII codes """
+
+    table = np.frombuffer(alphabet, dtype=np.uint8)
+    return table[rng.integers(0, len(table), n, dtype=np.uint8)]
+
+
+# --------------------------------------------------
+def test_random_seq() -> None:
+    """ Test random_seq """
+
+    assert random_seq(np.random.default_rng(1), 0).tobytes() == b''
+    seq = random_seq(np.random.default_rng(1), 1000).tobytes()
+    assert len(seq) == 1000
+    assert set(seq) == set(b'ACGT')
+    assert set(random_seq(np.random.default_rng(1), 100, b'AC')) == set(b'AC')
+    assert seq == random_seq(np.random.default_rng(1), 1000).tobytes()
+
+
+# --------------------------------------------------
+def make_batch(spec: Spec, batch: Batch) -> bytes:
+    """ Generate the records in one batch """
+
+    rng = np.random.default_rng(batch.seed)
+    lengths = np.full(batch.num_seqs, spec.seq_len, dtype=np.int64)
+    if spec.sigma:
+        lengths = rng.normal(spec.seq_len, spec.sigma,
+                             batch.num_seqs).astype(np.int64)
+    lengths = np.maximum(lengths, len(spec.motif))
+
+    bases = random_seq(rng, int(lengths.sum()), spec.alphabet)
+    ends = np.cumsum(lengths)
+    starts = ends - lengths
+
+    if spec.motif:
+        motif = np.frombuffer(spec.motif, dtype=np.uint8)
+        positions = starts + rng.integers(0, lengths - len(motif) + 1)
+        for pos in positions.tolist():
+            bases[pos:pos + len(motif)] = motif
+
+    # Equal-length plain sequences need only a column of newlines
+    if not spec.fasta and not spec.sigma:
+        lines = np.empty((batch.num_seqs, spec.seq_len + 1), dtype=np.uint8)
+        lines[:, :-1] = bases.reshape(batch.num_seqs, spec.seq_len)
+        lines[:, -1] = ord('\n')
+        return lines.tobytes()
+
+    out = io.BytesIO()
+    for i, (start, end) in enumerate(zip(starts.tolist(), ends.tolist())):
+        if spec.fasta:
+            out.write(f'>SEQ{batch.first + i}\n'.encode())
+        out.write(bases[start:end].data)
+        out.write(b'\n')
+
+    return out.getvalue()
+
+
+# --------------------------------------------------
+def batches(num_seqs: int, seq_len: int,
+            seed: Optional[int]) -> Iterator[Batch]:
+    """ Split the records into batches, each with its own seed """
+
+    size = max(1, BATCH_BASES // max(1, seq_len))
+    seeds = np.random.SeedSequence(seed).spawn((num_seqs + size - 1) // size)
+    for i, batch_seed in enumerate(seeds):
+        first = i * size
+        yield Batch(first, min(size, num_seqs - first), batch_seed)
+
+
+# --------------------------------------------------
+def test_batches() -> None:
+    """ Test batches """
+
+    assert not list(batches(0, 10, 1))
+    assert [(b.first, b.num_seqs) for b in batches(3, 10, 1)] == [(0, 3)]
+    assert [(b.first, b.num_seqs)
+            for b in batches(3, BATCH_BASES, 1)] == [(0, 1), (1, 1), (2, 1)]
+
+
+# --------------------------------------------------
+def generate(fh: BinaryIO,
+             num_seqs: int,
+             spec: Spec,
+             seed: Optional[int] = None,
+             workers: int = 1) -> None:
+    """ Write random sequences, the same seed gives the same output """
+
+    make = partial(make_batch, spec)
+    jobs = batches(num_seqs, spec.seq_len, seed)
+
+    # imap() hands back the batches in order as they finish
+    if workers > 1:
+        with Pool(workers) as pool:
+            for buf in pool.imap(make, jobs, chunksize=1):
+                fh.write(buf)
+    else:
+        for buf in map(make, jobs):
+            fh.write(buf)
+
+
+# --------------------------------------------------
+def make_motif(motif_len: int, seed: Optional[int] = None) -> bytes:
+    """ Make a random motif that does not share the sequences' seed """
+
+    rng = np.random.default_rng(
+        np.random.SeedSequence(seed, spawn_key=MOTIF_KEY))
+    return random_seq(rng, motif_len).tobytes()
+
+
+# --------------------------------------------------
+def test_generate() -> None:
+    """ Test generate """
+
+    def run(spec: Spec, num_seqs: int, workers: int = 1) -> bytes:
+        out = io.BytesIO()
+        generate(out, num_seqs, spec, seed=1, workers=workers)
+        return out.getvalue()
+
+    lines = run(Spec(10), 3).splitlines()
+    assert len(lines) == 3
+    assert all(len(line) == 10 for line in lines)
+
+    fasta = run(Spec(10, sigma=1., fasta=True, motif=b'GATTACA'), 3)
+    assert fasta.startswith(b'>SEQ0\n')
+    assert fasta.splitlines()[4] == b'>SEQ2'
+    assert fasta.count(b'GATTACA') >= 3
+
+    assert run(Spec(100), 5) == run(Spec(100), 5, workers=2)
+
+
+# --------------------------------------------------
+def test_make_motif() -> None:
+    """ Test make_motif """
+
+    assert len(make_motif(25, 1)) == 25
+    assert make_motif(25, 1) == make_motif(25, 1)
+
+    # The motif is not the start of the first sequence
+    out = io.BytesIO()
+    generate(out, 1, Spec(50), seed=1)
+    assert not out.getvalue().startswith(make_motif(25, 1))
@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+""" Measure the startup time and import cost of every program """
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, TextIO, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+CHAPTERS = sorted(
+    name for name in os.listdir(ROOT)
+    if re.match(r'^\d\d_', name) and os.path.isdir(os.path.join(ROOT, name)))
+
+Key = Tuple[str, str]
+
+# Small real inputs, so the imports a program makes only once it has its
+# arguments are counted, too. The runs are in the chapter directory, and
+# {out} is an empty temporary directory. The solutions in a chapter share
+# one interface, and other programs are listed by name. Any program not
+# listed, such as 11_mprt which downloads its inputs, only prints usage.
+RUN_ARGS: Dict[str, List[str]] = {
+    '01_dna': ['tests/inputs/input1.txt'],
+    '01_dna/tetra.py': ['../05_gc/tests/inputs/1.fa'],
+    '02_rna': ['-o', '{out}', 'tests/inputs/input1.txt'],
+    '02_rna/genseq.py': ['-l', '100', '-n', '2', '-o', '{out}/seqs.fa'],
+    '03_revc': ['tests/inputs/input1.txt'],
+    '03_revc/kmers.py': ['-l', '1000'],
+    '04_fib': ['5', '3'],
+    '05_gc': ['tests/inputs/1.fa'],
+    '05_gc/gc_window.py': ['tests/inputs/1.fa'],
+    '05_gc/genseq.py': ['-l', '100', '-n', '2', '-o', '{out}/seqs.fa'],
+    '06_hamm': ['GAGCCTACTAACGGGAT', 'CATCGTAATGACGGCCT'],
+    '06_hamm/hamm_matrix.py': ['../09_grph/tests/inputs/1.fa'],
+    '06_hamm/neighbors.py': ['../09_grph/tests/inputs/1.fa'],
+    '06_hamm/packed.py': ['-l', '1000'],
+    '07_prot': ['AUGGCCAUGGCGCCCAGAACUGAGAUCAAUAGUACCCGUAUUAACGGGUGA'],
+    '08_subs': ['GATATATGCATATACTT', 'ATAT'],
+    '09_grph': ['-k', '3', 'tests/inputs/1.fa'],
+    '10_lcsm': ['tests/inputs/1.fa'],
+    '10_lcsm/binsearch.py': ['-n', '7', '-m', '100'],
+    '10_lcsm/genseq.py': ['-l', '100', '-n', '2', '-o', '{out}/seqs.fa'],
+    '10_lcsm/scan_fh.py': ['tests/inputs/1.fa'],
+    '10_lcsm/scan_mem.py': ['tests/inputs/1.fa'],
+    '12_mrna': ['MA'],
+    '12_mrna/show_patterns.py': ['MA'],
+    '13_revp': ['tests/inputs/1.fa'],
+    '14_orf': ['tests/inputs/1.fa'],
+    '15_seqmagique': ['tests/inputs/1.fa'],
+    '16_fastx_grep': ['-o', '{out}/out.fq', 'LSU', 'tests/inputs/lsu.fq'],
+    '16_fastx_grep/asciitbl.py': [],
+    '17_synth': [
+        '-n', '1', '-s', '1', '-o', '{out}/out.fa',
+        'tests/inputs/CAM_SMPL_GS108.fa'
+    ],
+    '17_synth/kmer_tiler.py': ['ACGTACGT'],
+    '18_fastx_sampler':
+    ['-s', '1', '-o', '{out}', '../17_synth/tests/inputs/CAM_SMPL_GS108.fa'],
+    '18_fastx_sampler/sampler_dir_reader.py':
+    ['-s', '1', '-o', '{out}', '-d', '../05_gc/tests/inputs'],
+    '19_blastomatic': [
+        '-a', 'tests/inputs/meta.csv', '-b', 'tests/inputs/hits1.csv', '-o',
+        '{out}/out.csv'
+    ],
+}
+
+
+class Args(NamedTuple):
+    """ Command-line arguments """
+    chapters: List[str]
+    number: int
+    baseline: Optional[TextIO]
+    threshold: float
+    min_ms: float
+    outfile: TextIO
+
+
+# --------------------------------------------------
+def get_args() -> Args:
+    """ Get command-line arguments """
+
+    parser = argparse.ArgumentParser(
+        description='Measure the startup time and import cost of every '
+        'program',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+
+    parser.add_argument('chapter',
+                        metavar='chapter',
+                        nargs='*',
+                        default=CHAPTERS,
+                        help='Chapters to measure (e.g., 07_prot or 07)')
+
+    parser.add_argument('-n',
+                        '--number',
+                        metavar='int',
+                        type=int,
+                        default=5,
+                        help='Number of runs per program, the fastest is kept')
+
+    parser.add_argument('-b',
+                        '--baseline',
+                        metavar='FILE',
+                        type=argparse.FileType('rt'),
+                        help='Earlier JSON output to check for regressions')
+
+    parser.add_argument('-t',
+                        '--threshold',
+                        metavar='float',
+                        type=float,
+                        default=0.25,
+                        help='Allowed fractional slowdown')
+
+    parser.add_argument('-m',
+                        '--min_ms',
+                        metavar='float',
+                        type=float,
+                        default=20.,
+                        help='Ignore slowdowns of fewer milliseconds')
+
+    parser.add_argument('-o',
+                        '--outfile',
+                        metavar='FILE',
+                        type=argparse.FileType('wt'),
+                        default='startup.json',
+                        help='JSON output file')
+
+    args = parser.parse_args()
+
+    chapters = []
+    for chapter in args.chapter:
+        matches = [name for name in CHAPTERS if name.startswith(chapter)]
+        if not matches:
+            parser.error(f'Unknown chapter "{chapter}"')
+        chapters.extend(matches)
+
+    if args.number < 1:
+        parser.error(f'--number "{args.number}" must be greater than 0')
+
+    for name in ['threshold', 'min_ms']:
+        if (num := getattr(args, name)) < 0:
+            parser.error(f'--{name} "{num}" must be positive')
+
+    return Args(chapters, args.number, args.baseline, args.threshold,
+                args.min_ms, args.outfile)
+
+
+# --------------------------------------------------
+def main() -> None:
+    """ Make a jazz noise here """
+
+    args = get_args()
+    old = index(json.load(args.baseline)) if args.baseline else {}
+    results: List[Dict[str, Any]] = []
+    num_regressions = 0
+
+    for chapter in args.chapters:
+        for program in programs(os.path.join(ROOT, chapter)):
+            result = measure(chapter, program, args.number)
+            results.append(result)
+
+            flags = []
+            if (key := (chapter, program)) in old:
+                flags = regressions(old[key], result, args.threshold,
+                                    args.min_ms)
+                num_regressions += len(flags) > 0
+
+            print(format_result(result), *flags, flush=True)
+
+    json.dump(results, args.outfile, indent=2)
+    print(f'Done, see "{args.outfile.name}".')
+
+    if args.baseline:
+        print(f'{num_regressions} regression'
+              f'{"" if num_regressions == 1 else "s"} above '
+              f'{args.threshold:.0%} and {args.min_ms:g}ms.')
+        sys.exit(1 if num_regressions else 0)
+
+
+# --------------------------------------------------
+def programs(chapter_dir: str) -> List[str]:
+    """ The Python programs in a chapter, skipping the modules they import """
+
+    found = []
+    for name in sorted(os.listdir(chapter_dir)):
+        if name.endswith('.py'):
+            with open(os.path.join(chapter_dir, name), 'rt') as fh:
+                if "if __name__ == '__main__':" in fh.read():
+                    found.append(name)
+
+    return found
+
+
+# --------------------------------------------------
+def measure(chapter: str, program: str, number: int) -> Dict[str, Any]:
+    """ Time a program on a small input, and printing its usage """
+
+    argv = RUN_ARGS.get(f'{chapter}/{program}', RUN_ARGS.get(chapter))
+    if argv is None:
+        argv = ['-h']
+
+    result: Dict[str, Any] = {
+        'chapter': chapter,
+        'program': program,
+        'argv': argv
+    }
+    for prefix, args in [('', argv), ('usage_', ['-h'])]:
+        timing = run(chapter, program, args, number)
+        if 'error' in timing:
+            result['error'] = ' '.join([program] + args +
+                                       [f'failed: {timing["error"]}'])
+            return result
+        result.update({prefix + key: val for key, val in timing.items()})
+
+    return result
+
+
+# --------------------------------------------------
+def run(chapter: str, program: str, argv: List[str],
+        number: int) -> Dict[str, Any]:
+    """ Fastest time and import costs of several runs of a program """
+
+    times: List[float] = []
+    imports: Dict[str, int] = {}
+
+    for _ in range(number):
+        # Each run writes to a new directory, so none finds old outputs
+        with tempfile.TemporaryDirectory() as out_dir:
+            cmd = [sys.executable, '-X', 'importtime', program] + [
+                arg.replace('{out}', out_dir) for arg in argv
+            ]
+            start = time.perf_counter()
+            proc = subprocess.run(cmd,
+                                  cwd=os.path.join(ROOT, chapter),
+                                  stdin=subprocess.DEVNULL,
+                                  stdout=subprocess.DEVNULL,
+                                  stderr=subprocess.PIPE,
+                                  text=True,
+                                  timeout=60,
+                                  check=False)
+            times.append(time.perf_counter() - start)
+
+        if proc.returncode != 0:
+            lines = [
+                line for line in proc.stderr.splitlines()
+                if line.strip() and not line.startswith('import time:')
+            ]
+            return {'error': lines[-1] if lines else f'exit {proc.returncode}'}
+
+        # Keep the fastest time for each module, as with the total
+        for name, micros in parse_importtime(proc.stderr).items():
+            imports[name] = min(micros, imports.get(name, micros))
+
+    return {
+        'seconds': min(times),
+        'import_us': sum(imports.values()),
+        'imports': imports,
+    }
+
+
+# --------------------------------------------------
+def parse_importtime(text: str) -> Dict[str, int]:
+    """ Cumulative microseconds of each top-level import """
+
+    # Lines look like "import time:  self | cumulative | name", and
+    # the name is indented two spaces for each level of nesting
+    imports = {}
+    for line in text.splitlines():
+        if match := re.match(r'^import time:\s+(\d+) \|\s+(\d+) \| (\S.*)$',
+                             line):
+            imports[match.group(3)] = int(match.group(2))
+
+    return imports
+
+
+# --------------------------------------------------
+def test_parse_importtime() -> None:
+    """ Test parse_importtime """
+
+    assert not parse_importtime('')
+
+    text = '\n'.join([
+        'import time: self [us] | cumulative | imported package',
+        'import time:       262 |        262 |   _io',
+        'import time:      1480 |       4577 | site',
+        'import time:      3067 |      66295 | Bio.Seq',
+        'import time:     57127 |      57642 |   Bio.Data.CodonTable',
+        'usage: prog [-h]',
+    ])
+    assert parse_importtime(text) == {'site': 4577, 'Bio.Seq': 66295}
+
+
+# --------------------------------------------------
+def index(results: list) -> Dict[Key, Dict[str, Any]]:
+    """ Index the results of a run by chapter and program """
+
+    return {(r['chapter'], r['program']): r for r in results}
+
+
+# --------------------------------------------------
+def regressions(old: Dict[str, Any], new: Dict[str, Any], threshold: float,
+                min_ms: float) -> List[str]:
+    """ Describe how a new result starts more slowly than the old """
+
+    # A program that failed before, or ran on another input, has nothing
+    # to compare against
+    if 'error' in new or 'error' in old:
+        return ['ERROR'] if 'error' not in old else []
+
+    if old.get('argv') != new.get('argv'):
+        return []
+
+    def slower(old_us: float, new_us: float) -> bool:
+        return new_us - old_us > 1000 * min_ms and \
+            new_us > old_us * (1 + threshold)
+
+    flags = []
+    for field, name in [('seconds', 'SLOWER'), ('usage_seconds', 'SLOWER -h')]:
+        if field in old and slower(1e6 * old[field], 1e6 * new[field]):
+            flags.append(name)
+
+    # New imports count from zero, so a newly added heavy module shows up
+    old_imports = old.get('imports', {})
+    for name, micros in sorted(new['imports'].items()):
+        if slower(before := old_imports.get(name, 0), micros):
+            flags.append(f'{name} +{(micros - before) / 1000:.1f}ms')
+
+    return flags
+
+
+# --------------------------------------------------
+def test_regressions() -> None:
+    """ Test regressions """
+
+    old = {
+        'argv': ['AUG'],
+        'seconds': .05,
+        'usage_seconds': .04,
+        'imports': {
+            'site': 4000,
+            'argparse': 6000
+        }
+    }
+    assert not regressions(old, old, .25, 5.)
+
+    same = dict(old, seconds=.052, imports={'site': 4500, 'argparse': 9000})
+    assert not regressions(old, same, .25, 5.)
+
+    numpy = dict(old,
+                 seconds=.2,
+                 imports={
+                     'site': 4000,
+                     'argparse': 6000,
+                     'numpy': 120000
+                 })
+    assert regressions(old, numpy, .25, 5.) == ['SLOWER', 'numpy +120.0ms']
+    assert not regressions(numpy, old, .25, 5.)
+    assert not regressions(old, dict(numpy, argv=['-h']), .25, 5.)
+
+    top_level = dict(old, usage_seconds=.2)
+    assert regressions(old, top_level, .25, 5.) == ['SLOWER -h']
+
+    assert regressions(old, {'error': 'ImportError'}, .25, 5.) == ['ERROR']
+    assert not regressions({'error': 'ImportError'}, old, .25, 5.)
+
+
+# --------------------------------------------------
+def format_result(result: Dict[str, Any]) -> str:
+    """ Format one result for the terminal, naming the slowest imports """
+
+    name = f'{result["chapter"]}/{result["program"]}'
+    if 'error' in result:
+        return f'{name:50} {result["error"]}'
+
+    heaviest = sorted(result['imports'].items(), key=lambda kv: -kv[1])[:3]
+    return (f'{name:50} {result["seconds"]:8.4f}s '
+            f'{result["usage_seconds"]:8.4f}s -h '
+            f'{result["import_us"] / 1000:8.1f}ms imports  ' +
+            ', '.join(f'{mod} {micros / 1000:.1f}ms'
+                      for mod, micros in heaviest))
+
+
+# --------------------------------------------------
+def test_format_result() -> None:
+    """ Test format_result """
+
+    assert format_result({
+        'chapter': '07_prot',
+        'program': 'solution5_bio_seq.py',
+        'error': "solution5_bio_seq.py AUG failed: ModuleNotFoundError: "
+        "No module named 'Bio'"
+    }) == f'{"07_prot/solution5_bio_seq.py":50} solution5_bio_seq.py AUG ' \
+        "failed: ModuleNotFoundError: No module named 'Bio'"
+
+    assert format_result({
+        'chapter': '01_dna',
+        'program': 'solution1_iter.py',
+        'seconds': .0123,
+        'usage_seconds': .011,
+        'import_us': 9000,
+        'imports': {'site': 4500, 'argparse': 4000, 'typing': 500}
+    }) == f'{"01_dna/solution1_iter.py":50}   0.0123s   0.0110s -h ' \
+        '     9.0ms imports  site 4.5ms, argparse 4.0ms, typing 0.5ms'
+
+
+# --------------------------------------------------
+if __name__ == '__main__':
+    main()